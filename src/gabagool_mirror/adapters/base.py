@@ -5,10 +5,12 @@ All exchange adapters implement this interface for consistency.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
 
+import numpy as np
+
 
 @dataclass
 class AdapterConfig:
@@ -73,6 +75,45 @@ class Orderbook:
     no_bids: List[OrderbookLevel]
     no_asks: List[OrderbookLevel]
     
+    # Per-side (levels, count, prices, qtys), built on first use by level_arrays()
+    _level_arrays: Dict[str, Tuple[List[OrderbookLevel], int, np.ndarray, np.ndarray]] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    
+    def level_arrays(self, book_side: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get one side of the book as parallel price/quantity arrays.
+        
+        Levels are sorted best to worst (asks ascending, bids descending)
+        even if the venue returned them in another order. The arrays are
+        rebuilt when the side's level list is replaced or changes length;
+        editing a level in place is not detected.
+        
+        Args:
+            book_side: "yes_bids", "yes_asks", "no_bids" or "no_asks"
+            
+        Returns:
+            (prices, qtys) float64 arrays, best level first
+        """
+        levels = getattr(self, book_side)
+        cached = self._level_arrays.get(book_side)
+        if cached is not None and cached[0] is levels and cached[1] == len(levels):
+            return cached[2], cached[3]
+        
+        n = len(levels)
+        prices = np.fromiter((level.price for level in levels), dtype=np.float64, count=n)
+        qtys = np.fromiter((level.qty for level in levels), dtype=np.float64, count=n)
+        
+        # Best first: asks ascending, bids descending
+        keys = prices if book_side.endswith("asks") else -prices
+        if n > 1 and (keys[1:] < keys[:-1]).any():
+            order = np.argsort(keys, kind="stable")
+            prices = prices[order]
+            qtys = qtys[order]
+        
+        self._level_arrays[book_side] = (levels, n, prices, qtys)
+        return prices, qtys
+    
     @property
     def yes_best_bid(self) -> Optional[float]:
         return self.yes_bids[0].price if self.yes_bids else None
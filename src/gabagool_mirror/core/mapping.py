@@ -11,6 +11,54 @@ from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+# Single-pass keyword scan for the underlying when pyahocorasick is available
+try:
+    import ahocorasick
+    AHOCORASICK = True
+except ImportError:
+    AHOCORASICK = False
+
+
+# Polymarket title time window: "6:45PM-7:00PM" or "7PM"
+_TIME_WINDOW_RE = re.compile(
+    r"(\d{1,2}):?(\d{2})?(PM|AM)(?:-(\d{1,2}):?(\d{2})?(PM|AM))?",
+    re.IGNORECASE
+)
+_POLY_DATE_RE = re.compile(r"January (\d{1,2})")
+
+# Kalshi ticker expiry segment: "-26JAN071845-" (YY MMM DD HHMM, ET)
+_KALSHI_EXPIRY_RE = re.compile(r"-(?P<expiry>\d{2}[A-Z]{3}\d{6})-")
+
+_MONTHS = {"JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
+           "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12}
+
+# Kalshi index expiry bucket width
+_EXPIRY_BUCKET_MS = 5 * 60 * 1000
+
+# Expiry segment ("26JAN071845") -> expiry_ts; many tickers share an expiry.
+# Reset once it holds _EXPIRY_CACHE_SIZE segments.
+_EXPIRY_CACHE: Dict[str, int] = {}
+_EXPIRY_CACHE_SIZE = 4096
+
+
+def _kalshi_expiry_ts(segment: str) -> int:
+    """Parse a Kalshi YYMMMDDHHMM expiry (ET) into a UTC timestamp in ms."""
+    expiry_ts = _EXPIRY_CACHE.get(segment)
+    if expiry_ts is None:
+        expiry = datetime(
+            2000 + int(segment[0:2]),
+            _MONTHS.get(segment[2:5], 1),
+            int(segment[5:7]),
+            int(segment[7:9]),
+            int(segment[9:11])
+        )
+        expiry = expiry + timedelta(hours=5)  # ET to UTC
+        expiry_ts = int(expiry.timestamp() * 1000)
+        if len(_EXPIRY_CACHE) >= _EXPIRY_CACHE_SIZE:
+            _EXPIRY_CACHE.clear()
+        _EXPIRY_CACHE[segment] = expiry_ts
+    return expiry_ts
+
 
 class Underlying(str, Enum):
     """Supported underlying assets."""
@@ -20,6 +68,39 @@ class Underlying(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Title keywords per underlying, in detection priority order
+_UNDERLYING_KEYWORDS = (
+    (Underlying.BTC, ("bitcoin", "btc")),
+    (Underlying.ETH, ("ethereum", "eth")),
+    (Underlying.SOL, ("solana", "sol")),
+)
+
+# Kalshi series prefix -> underlying (e.g. "KXBTC15M-..." -> BTC)
+_PREFIX_MAP = {
+    "KXBTC": Underlying.BTC,
+    "KXETH": Underlying.ETH,
+    "KXSOL": Underlying.SOL,
+}
+
+if AHOCORASICK:
+    _UNDERLYING_AUTOMATON = ahocorasick.Automaton()
+    for _priority, (_underlying, _keywords) in enumerate(_UNDERLYING_KEYWORDS):
+        for _keyword in _keywords:
+            _UNDERLYING_AUTOMATON.add_word(_keyword, (_priority, _underlying))
+    _UNDERLYING_AUTOMATON.make_automaton()
+
+
+def _detect_underlying(title_lower: str) -> Underlying:
+    """Detect the underlying from a lowercased title (BTC, then ETH, then SOL)."""
+    if AHOCORASICK:
+        hits = [value for _, value in _UNDERLYING_AUTOMATON.iter(title_lower)]
+        return min(hits)[1] if hits else Underlying.UNKNOWN
+    for underlying, keywords in _UNDERLYING_KEYWORDS:
+        if any(keyword in title_lower for keyword in keywords):
+            return underlying
+    return Underlying.UNKNOWN
+
+
 class ContractType(str, Enum):
     """Contract types."""
     UP_DOWN_15M = "UP_DOWN_15M"  # 15-minute up/down
@@ -29,9 +110,9 @@ class ContractType(str, Enum):
     UNKNOWN = "UNKNOWN"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class MarketFeatures:
-    """Extracted features from a market."""
+    """Extracted features from a market (immutable, hashable for score caching)."""
     underlying: Underlying = Underlying.UNKNOWN
     contract_type: ContractType = ContractType.UNKNOWN
     expiry_ts: Optional[int] = None  # Unix timestamp ms
@@ -40,6 +121,18 @@ class MarketFeatures:
     raw_title: str = ""
 
 
+# score_mapping breakdown for pairs whose underlyings differ (copied per call)
+_UNDERLYING_MISMATCH = {
+    "underlying": 0.0,
+    "time_proximity": 0.0,
+    "contract_type": 0.0,
+    "strike_similarity": 0.0,
+}
+
+# (underlying, window_minutes, expiry bucket) -> [(kalshi market, features)]
+KalshiIndex = Dict[Tuple[Underlying, int, Optional[int]], List[Tuple[Dict[str, Any], MarketFeatures]]]
+
+
 @dataclass 
 class MappingResult:
     """Result of mapping a Polymarket market to Kalshi."""
@@ -87,9 +180,21 @@ class MarketMapping:
     # Time proximity settings
     MAX_TIME_DIFF_MINUTES = 30  # Max acceptable time difference
     
+    # Memoized (poly, kalshi) feature pairs before the score cache is reset
+    SCORE_CACHE_SIZE = 16384
+    
+    # Parsed Kalshi tickers kept before the feature cache is reset
+    FEATURE_CACHE_SIZE = 4096
+    
     def __init__(self):
         self._kalshi_markets_cache: Dict[str, Any] = {}
+        self._kalshi_index: KalshiIndex = {}
         self._mapping_cache: Dict[str, MappingResult] = {}
+        self._score_cache: Dict[Tuple[MarketFeatures, MarketFeatures], Tuple[float, Dict[str, float]]] = {}
+        self._kalshi_features_cache: Dict[str, MarketFeatures] = {}
+        
+        # Time proximity tolerance in ms, fixed for the mapper's lifetime
+        self._max_time_diff_ms = self.MAX_TIME_DIFF_MINUTES * 60 * 1000
     
     def extract_polymarket_features(self, title: str, market_id: str = "") -> MarketFeatures:
         """
@@ -99,28 +204,24 @@ class MarketMapping:
         - "Bitcoin Up or Down - January 7, 6:45PM-7:00PM ET"
         - "Ethereum Up or Down - January 7, 7PM ET"
         """
-        features = MarketFeatures(raw_title=title)
+        contract_type = ContractType.UNKNOWN
+        window_minutes = 15
+        expiry_ts = None
         
         # Detect underlying
         title_lower = title.lower()
-        if "bitcoin" in title_lower or "btc" in title_lower:
-            features.underlying = Underlying.BTC
-        elif "ethereum" in title_lower or "eth" in title_lower:
-            features.underlying = Underlying.ETH
-        elif "solana" in title_lower or "sol" in title_lower:
-            features.underlying = Underlying.SOL
+        underlying = _detect_underlying(title_lower)
         
         # Detect contract type
         if "up or down" in title_lower:
-            features.contract_type = ContractType.UP_DOWN_15M
-            features.window_minutes = 15
+            contract_type = ContractType.UP_DOWN_15M
+            window_minutes = 15
         elif "above" in title_lower or "below" in title_lower:
-            features.contract_type = ContractType.ABOVE_BELOW
+            contract_type = ContractType.ABOVE_BELOW
         
         # Extract time window
         # Pattern: "6:45PM-7:00PM" or "7PM ET"
-        time_pattern = r"(\d{1,2}):?(\d{2})?(PM|AM)(?:-(\d{1,2}):?(\d{2})?(PM|AM))?"
-        match = re.search(time_pattern, title, re.IGNORECASE)
+        match = _TIME_WINDOW_RE.search(title)
         
         if match:
             # Parse start time
@@ -144,16 +245,16 @@ class MarketMapping:
                 elif end_ampm == "AM" and end_h == 12:
                     end_h = 0
                 
-                features.window_minutes = (end_h * 60 + end_m) - (start_h * 60 + start_m)
+                window_minutes = (end_h * 60 + end_m) - (start_h * 60 + start_m)
             else:
-                features.window_minutes = 15  # Default
+                window_minutes = 15  # Default
             
             # Calculate expiry timestamp (assuming today, ET timezone)
             # ET is UTC-5 or UTC-4 depending on DST
             today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
             
             # Parse date from title if present
-            date_match = re.search(r"January (\d{1,2})", title)
+            date_match = _POLY_DATE_RE.search(title)
             if date_match:
                 day = int(date_match.group(1))
                 today = today.replace(day=day, month=1)
@@ -171,9 +272,15 @@ class MarketMapping:
             
             expiry = today.replace(hour=end_hour, minute=end_minute)
             expiry = expiry + timedelta(hours=5)  # ET to UTC
-            features.expiry_ts = int(expiry.timestamp() * 1000)
+            expiry_ts = int(expiry.timestamp() * 1000)
         
-        return features
+        return MarketFeatures(
+            underlying=underlying,
+            contract_type=contract_type,
+            expiry_ts=expiry_ts,
+            window_minutes=window_minutes,
+            raw_title=title
+        )
     
     def extract_kalshi_features(self, market: Dict[str, Any]) -> MarketFeatures:
         """
@@ -184,57 +291,68 @@ class MarketMapping:
         - 26JAN07 = Jan 7, 2026
         - 1845 = 6:45 PM ET
         - 45 = strike related
+        
+        Features are memoized by ticker, since a ticker's expiry and strike
+        never change.
         """
         ticker = market.get("ticker", "")
+        cached = self._kalshi_features_cache.get(ticker) if ticker else None
+        if cached is not None:
+            return cached
+        
         title = market.get("title", "")
         
-        features = MarketFeatures(raw_title=title)
+        contract_type = ContractType.UNKNOWN
+        window_minutes = 15
+        expiry_ts = None
+        strike = None
         
         # Parse ticker
         ticker_upper = ticker.upper()
         
-        # Detect underlying
-        if "BTC" in ticker_upper:
-            features.underlying = Underlying.BTC
-        elif "ETH" in ticker_upper:
-            features.underlying = Underlying.ETH
-        elif "SOL" in ticker_upper:
-            features.underlying = Underlying.SOL
+        # Detect underlying from the series prefix, falling back to a
+        # substring scan for tickers outside the KX series
+        underlying = _PREFIX_MAP.get(ticker_upper[:5])
+        if underlying is None:
+            if "BTC" in ticker_upper:
+                underlying = Underlying.BTC
+            elif "ETH" in ticker_upper:
+                underlying = Underlying.ETH
+            elif "SOL" in ticker_upper:
+                underlying = Underlying.SOL
+            else:
+                underlying = Underlying.UNKNOWN
         
         # Detect contract type from ticker
         if "15M" in ticker_upper:
-            features.contract_type = ContractType.UP_DOWN_15M
-            features.window_minutes = 15
+            contract_type = ContractType.UP_DOWN_15M
+            window_minutes = 15
         elif "1H" in ticker_upper:
-            features.contract_type = ContractType.UP_DOWN_1H
-            features.window_minutes = 60
-        
-        # Parse time from ticker: KXBTC15M-26JAN071845-45
-        time_match = re.search(r"-\d{2}[A-Z]{3}\d{2}(\d{4})-", ticker)
-        if time_match:
-            time_str = time_match.group(1)  # e.g., "1845"
-            hour = int(time_str[:2])
-            minute = int(time_str[2:])
-            
-            # Parse date
-            date_match = re.search(r"-(\d{2})([A-Z]{3})(\d{2})", ticker)
-            if date_match:
-                year = 2000 + int(date_match.group(1))
-                month_str = date_match.group(2)
-                day = int(date_match.group(3))
-                
-                months = {"JAN": 1, "FEB": 2, "MAR": 3, "APR": 4, "MAY": 5, "JUN": 6,
-                         "JUL": 7, "AUG": 8, "SEP": 9, "OCT": 10, "NOV": 11, "DEC": 12}
-                month = months.get(month_str, 1)
-                
-                # Build expiry (time is in ET)
-                expiry = datetime(year, month, day, hour, minute)
-                expiry = expiry + timedelta(hours=5)  # ET to UTC
-                features.expiry_ts = int(expiry.timestamp() * 1000)
+            contract_type = ContractType.UP_DOWN_1H
+            window_minutes = 60
+        
+        # Parse date and time from ticker: KXBTC15M-26JAN071845-45
+        expiry_match = _KALSHI_EXPIRY_RE.search(ticker)
+        if expiry_match:
+            expiry_ts = _kalshi_expiry_ts(expiry_match.group("expiry"))
         
         # Parse strike from market data
         if market.get("floor_strike"):
-            features.strike = float(market["floor_strike"])
+            strike = float(market["floor_strike"])
+        
+        features = MarketFeatures(
+            underlying=underlying,
+            contract_type=contract_type,
+            expiry_ts=expiry_ts,
+            strike=strike,
+            window_minutes=window_minutes,
+            raw_title=title
+        )
+        
+        if ticker:
+            if len(self._kalshi_features_cache) >= self.FEATURE_CACHE_SIZE:
+                self._kalshi_features_cache.clear()
+            self._kalshi_features_cache[ticker] = features
         
         return features
     
@@ -246,24 +364,35 @@ class MarketMapping:
         """
         Calculate mapping score between Polymarket and Kalshi markets.
         
+        Pairs with different underlyings score 0.0 outright (their other
+        sub-scores can add at most 0.6, below any usable confidence).
+        Results are memoized per feature pair; the cache is reset when the
+        Kalshi index is rebuilt or it grows past SCORE_CACHE_SIZE; each call
+        returns its own copy of the breakdown.
+        
         Returns:
             (total_score, breakdown_dict)
         """
+        if poly_features.underlying != kalshi_features.underlying:
+            return 0.0, dict(_UNDERLYING_MISMATCH)
+        
+        key = (poly_features, kalshi_features)
+        cached = self._score_cache.get(key)
+        if cached is not None:
+            return cached[0], dict(cached[1])
+        
         breakdown = {}
         
-        # 1. Underlying match (binary)
-        if poly_features.underlying == kalshi_features.underlying:
-            breakdown["underlying"] = 1.0
-        else:
-            breakdown["underlying"] = 0.0
+        # 1. Underlying match (mismatches returned above)
+        breakdown["underlying"] = 1.0
         
         # 2. Time proximity (linear decay)
         if poly_features.expiry_ts and kalshi_features.expiry_ts:
             time_diff_ms = abs(poly_features.expiry_ts - kalshi_features.expiry_ts)
-            time_diff_minutes = time_diff_ms / (60 * 1000)
+            max_time_diff_ms = self._max_time_diff_ms
             
-            if time_diff_minutes <= self.MAX_TIME_DIFF_MINUTES:
-                breakdown["time_proximity"] = 1.0 - (time_diff_minutes / self.MAX_TIME_DIFF_MINUTES)
+            if time_diff_ms <= max_time_diff_ms:
+                breakdown["time_proximity"] = 1.0 - (time_diff_ms / max_time_diff_ms)
             else:
                 breakdown["time_proximity"] = 0.0
         else:
@@ -292,13 +421,74 @@ class MarketMapping:
             breakdown["strike_similarity"] * self.WEIGHT_STRIKE
         )
         
-        return total, breakdown
+        if len(self._score_cache) >= self.SCORE_CACHE_SIZE:
+            self._score_cache.clear()
+        self._score_cache[key] = (total, breakdown)
+        
+        return total, dict(breakdown)
+    
+    @staticmethod
+    def _index_key(features: MarketFeatures) -> Tuple[Underlying, int, Optional[int]]:
+        """Kalshi index key: (underlying, window, 5-minute expiry bucket)."""
+        bucket = features.expiry_ts // _EXPIRY_BUCKET_MS if features.expiry_ts else None
+        return (features.underlying, features.window_minutes, bucket)
+    
+    def build_kalshi_index(
+        self,
+        kalshi_markets: List[Dict[str, Any]]
+    ) -> KalshiIndex:
+        """
+        Parse Kalshi markets once and bucket them for find_best_kalshi_match.
+        
+        Markets are keyed by (underlying, window_minutes, expiry_ts // 5 min).
+        The index is kept on the mapper and also returned.
+        
+        Args:
+            kalshi_markets: List of available Kalshi markets
+            
+        Returns:
+            Dict of index key -> list of (market, features)
+        """
+        index: KalshiIndex = {}
+        for km in kalshi_markets:
+            features = self.extract_kalshi_features(km)
+            index.setdefault(self._index_key(features), []).append((km, features))
+        
+        self._kalshi_index = index
+        self._score_cache.clear()  # Market list rotated
+        return index
+    
+    def _index_candidates(
+        self,
+        poly_features: MarketFeatures,
+        index: KalshiIndex
+    ) -> List[Tuple[Dict[str, Any], MarketFeatures]]:
+        """
+        Kalshi candidates for a Polymarket market from an index.
+        
+        Only buckets within MAX_TIME_DIFF_MINUTES of the Polymarket expiry can
+        score on time proximity, so those are tried first; if they are empty
+        (or the market has no underlying/expiry) every indexed market is used.
+        """
+        underlying, window, bucket = self._index_key(poly_features)
+        
+        candidates = []
+        if underlying != Underlying.UNKNOWN and bucket is not None:
+            reach = -(-self._max_time_diff_ms // _EXPIRY_BUCKET_MS)  # ceil
+            for b in range(bucket - reach, bucket + reach + 1):
+                candidates.extend(index.get((underlying, window, b), ()))
+        
+        if not candidates:
+            candidates = [entry for entries in index.values() for entry in entries]
+        
+        return candidates
     
     def find_best_kalshi_match(
         self,
         polymarket_title: str,
         polymarket_market_id: str,
-        kalshi_markets: List[Dict[str, Any]]
+        kalshi_markets: List[Dict[str, Any]],
+        kalshi_index: Optional[KalshiIndex] = None
     ) -> MappingResult:
         """
         Find the best Kalshi market match for a Polymarket market.
@@ -307,19 +497,26 @@ class MarketMapping:
             polymarket_title: Polymarket market title
             polymarket_market_id: Polymarket market ID
             kalshi_markets: List of available Kalshi markets
+            kalshi_index: Optional index from build_kalshi_index; when given,
+                only markets near the Polymarket expiry are scored and
+                kalshi_markets is ignored
             
         Returns:
             MappingResult with best match or no match
         """
         poly_features = self.extract_polymarket_features(polymarket_title, polymarket_market_id)
         
+        if kalshi_index is not None:
+            candidates = self._index_candidates(poly_features, kalshi_index)
+        else:
+            candidates = ((km, self.extract_kalshi_features(km)) for km in kalshi_markets)
+        
         best_score = 0.0
         best_match = None
         best_breakdown = {}
         best_kalshi_features = None
         
-        for km in kalshi_markets:
-            kalshi_features = self.extract_kalshi_features(km)
+        for km, kalshi_features in candidates:
             score, breakdown = self.score_mapping(poly_features, kalshi_features)
             
             if score > best_score:
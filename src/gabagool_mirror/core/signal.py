@@ -5,12 +5,13 @@ Every gabagool trade is converted to a CopySignal with deterministic ID
 generation for idempotent processing.
 """
 
+import copy
 import hashlib
 import json
 from datetime import datetime
 from enum import Enum
 from typing import Any, Dict, Optional
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 
 
 class SignalSide(str, Enum):
@@ -25,7 +26,12 @@ class SignalAction(str, Enum):
     SELL = "SELL"
 
 
-@dataclass
+# Value -> member lookups for from_dict (cheaper than calling the Enum)
+_SIDES = {side.value: side for side in SignalSide}
+_ACTIONS = {action.value: action for action in SignalAction}
+
+
+@dataclass(slots=True)
 class CopySignal:
     """
     Canonical signal representing a gabagool trade to copy.
@@ -84,12 +90,9 @@ class CopySignal:
         Returns:
             Deterministic SHA256-based signal ID
         """
-        components = [
-            str(polymarket_trade_id),
-            str(fill_index),
-            str(tx_hash or "")
-        ]
-        payload = "|".join(components)
+        # IDs are persisted for dedup, so the "trade|fill|tx" payload and the
+        # SHA256 prefix must stay stable across versions
+        payload = f"{polymarket_trade_id}|{fill_index}|{tx_hash or ''}"
         return hashlib.sha256(payload.encode()).hexdigest()[:32]
     
     @classmethod
@@ -174,19 +177,29 @@ class CopySignal:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization."""
-        d = asdict(self)
-        d["side"] = self.side.value
-        d["action"] = self.action.value
-        if self.created_at:
-            d["created_at"] = self.created_at.isoformat()
-        return d
+        return {
+            "signal_id": self.signal_id,
+            "ts_ms": self.ts_ms,
+            "source": self.source,
+            "polymarket_market_id": self.polymarket_market_id,
+            "polymarket_event_name": self.polymarket_event_name,
+            "polymarket_slug": self.polymarket_slug,
+            "side": self.side.value,
+            "action": self.action.value,
+            "qty": self.qty,
+            "price": self.price,
+            "value_usd": self.value_usd,
+            "meta": copy.deepcopy(self.meta),
+            "processed": self.processed,
+            "created_at": self.created_at.isoformat() if self.created_at else self.created_at,
+        }
     
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "CopySignal":
         """Create from dictionary."""
         d = d.copy()
-        d["side"] = SignalSide(d["side"])
-        d["action"] = SignalAction(d["action"])
+        d["side"] = _SIDES[d["side"]]
+        d["action"] = _ACTIONS[d["action"]]
         if d.get("created_at"):
             d["created_at"] = datetime.fromisoformat(d["created_at"])
         return cls(**d)
@@ -11,6 +11,7 @@ With hard safety bounds to prevent catastrophic settings.
 
 import numpy as np
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
@@ -26,6 +27,7 @@ class LearnerConfig:
     """Configuration for online learner."""
     # Exploration
     epsilon: float = 0.1  # Exploration rate
+    seed: Optional[int] = None  # Exploration RNG seed (None = fresh entropy)
     
     # Safety bounds
     min_mapping_confidence_bounds: Tuple[float, float] = (0.5, 0.95)
@@ -43,7 +45,7 @@ class LearnerConfig:
     max_drawdown_pct: float = 0.20
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class TradeOutcome:
     """Outcome of a trade for learning."""
     timestamp: datetime
@@ -75,6 +77,12 @@ class OnlineLearner:
     Falls back to conservative defaults on circuit breaker.
     """
     
+    # Exploration coins are drawn in blocks of this size
+    COIN_BLOCK = 4096
+    
+    # Minimum seconds between circuit breaker warnings from get_action
+    BREAKER_WARNING_INTERVAL_S = 60.0
+    
     def __init__(self, config: Optional[LearnerConfig] = None):
         """
         Initialize learner.
@@ -95,6 +103,7 @@ class OnlineLearner:
         self.default_min_mapping_confidence = 0.8
         self.default_slippage_bps_buffer = 75
         self.default_max_qty_scale = 0.3
+        self._defaults_tuple = self._make_defaults_tuple()
         
         # History
         self.outcomes: deque = deque(maxlen=self.config.max_history)
@@ -117,6 +126,14 @@ class OnlineLearner:
         # Stats
         self.explorations = 0
         self.exploitations = 0
+        
+        # Exploration RNG with pre-drawn epsilon-greedy coins
+        self._rng = np.random.default_rng(self.config.seed)
+        self._coin_buf = self._rng.random(self.COIN_BLOCK)
+        self._coin_idx = 0
+        
+        # Monotonic time of the last circuit breaker warning from get_action
+        self._breaker_warned_at: Optional[float] = None
     
     def get_features(
         self,
@@ -157,12 +174,14 @@ class OnlineLearner:
         """
         # If circuit breaker is active, return conservative defaults
         if self.circuit_breaker_active:
-            logger.warning("Circuit breaker active - using conservative defaults")
-            return (
-                self.default_min_mapping_confidence,
-                self.default_slippage_bps_buffer,
-                self.default_max_qty_scale
-            )
+            now = time.monotonic()
+            if (
+                self._breaker_warned_at is None
+                or now - self._breaker_warned_at >= self.BREAKER_WARNING_INTERVAL_S
+            ):
+                logger.warning("Circuit breaker active - using conservative defaults")
+                self._breaker_warned_at = now
+            return self._defaults_tuple
         
         features = self.get_features(
             spread_bps, depth, volatility,
@@ -170,7 +189,13 @@ class OnlineLearner:
         )
         
         # Epsilon-greedy exploration
-        if np.random.random() < self.config.epsilon:
+        if self._coin_idx == self.COIN_BLOCK:
+            self._coin_buf = self._rng.random(self.COIN_BLOCK)
+            self._coin_idx = 0
+        coin = self._coin_buf[self._coin_idx]
+        self._coin_idx += 1
+        
+        if coin < self.config.epsilon:
             self.explorations += 1
             return self._explore()
         
@@ -201,17 +226,17 @@ class OnlineLearner:
         """
         Random exploration within bounds.
         """
-        confidence = np.random.uniform(
+        confidence = self._rng.uniform(
             self.config.min_mapping_confidence_bounds[0],
             self.config.min_mapping_confidence_bounds[1]
         )
         
-        slippage = np.random.randint(
+        slippage = int(self._rng.integers(
             self.config.slippage_bps_buffer_bounds[0],
             self.config.slippage_bps_buffer_bounds[1] + 1
-        )
+        ))
         
-        scale = np.random.uniform(
+        scale = self._rng.uniform(
             self.config.max_qty_scale_bounds[0],
             self.config.max_qty_scale_bounds[1]
         )
@@ -259,6 +284,54 @@ class OnlineLearner:
         # Update weights using online ridge regression
         self._update_weights(outcome)
     
+    def record_outcomes_batch(self, outcomes: List[TradeOutcome]) -> None:
+        """
+        Record many trade outcomes at once (e.g. when replaying history).
+        
+        Equivalent to calling record_outcome for each outcome in order, but
+        PnL, drawdown and loss-streak tracking are computed with array scans.
+        
+        Args:
+            outcomes: Trade outcomes, oldest first
+        """
+        n = len(outcomes)
+        if n == 0:
+            return
+        
+        self.outcomes.extend(outcomes)
+        
+        # Running PnL and peak, continuing from the current totals
+        pnls = np.fromiter((o.pnl for o in outcomes), dtype=np.float64, count=n)
+        cum = self.total_pnl + np.cumsum(pnls)
+        peak = np.maximum(np.maximum.accumulate(cum), self.peak_pnl)
+        drawdown = np.divide(peak - cum, peak, out=np.zeros(n), where=peak > 0)
+        
+        # Loss streak ending at each outcome: distance to the last non-loss,
+        # or the carried-over streak plus everything so far if there is none
+        idx = np.arange(n)
+        last_reset = np.maximum.accumulate(np.where(pnls < 0, -1, idx))
+        streak = np.where(last_reset >= 0, idx - last_reset, idx + 1 + self.consecutive_losses)
+        
+        self.total_pnl = float(cum[-1])
+        self.peak_pnl = float(peak[-1])
+        self.consecutive_losses = int(streak[-1])
+        
+        # Check circuit breaker conditions at the first outcome that trips it
+        tripped = (streak >= self.config.max_consecutive_losses) | (drawdown >= self.config.max_drawdown_pct)
+        if not self.circuit_breaker_active and tripped.any():
+            first = int(np.argmax(tripped))
+            logger.warning(
+                f"CIRCUIT BREAKER TRIGGERED: "
+                f"consecutive_losses={streak[first]}, "
+                f"drawdown={drawdown[first]:.1%}"
+            )
+            self.circuit_breaker_active = True
+            self._revert_to_defaults()
+        
+        # Weight updates depend on the previous weights, so stay sequential
+        for outcome in outcomes:
+            self._update_weights(outcome)
+    
     def _update_weights(self, outcome: TradeOutcome) -> None:
         """
         Update weights using online ridge regression.
@@ -298,6 +371,14 @@ class OnlineLearner:
             error = reward * targets[arm] - prediction
             self.weights[:, arm] += self.config.learning_rate * error * features
     
+    def _make_defaults_tuple(self) -> Tuple[float, int, float]:
+        """Conservative defaults as an action tuple."""
+        return (
+            self.default_min_mapping_confidence,
+            self.default_slippage_bps_buffer,
+            self.default_max_qty_scale
+        )
+    
     def _revert_to_defaults(self) -> None:
         """Revert to conservative defaults."""
         self.min_mapping_confidence = self.default_min_mapping_confidence
@@ -309,6 +390,8 @@ class OnlineLearner:
         logger.info("Circuit breaker reset")
         self.circuit_breaker_active = False
         self.consecutive_losses = 0
+        self._breaker_warned_at = None
+        self._defaults_tuple = self._make_defaults_tuple()
     
     def get_stats(self) -> dict:
         """Get learner statistics."""
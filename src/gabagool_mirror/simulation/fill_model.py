@@ -13,6 +13,8 @@ from typing import List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
+import numpy as np
+
 from ..adapters.base import Orderbook, OrderbookLevel
 from ..config import get_settings
 
@@ -90,6 +92,17 @@ class FillModel:
         self.fee_bps = fee_bps or settings.kalshi_fee_bps
         self.slippage_buffer_bps = slippage_buffer_bps or settings.slippage_bps_buffer
         self.default_latency_ms = default_latency_ms or settings.default_latency_ms
+        
+        # Fee and buffer as fractions, fixed for the model's lifetime
+        self._fee_rate = self.fee_bps / 10000
+        self._buffer = self.slippage_buffer_bps / 10000
+    
+    @staticmethod
+    def _book_side(side: str, action: str) -> str:
+        """Orderbook side an order takes liquidity from (e.g. BUY YES -> yes_asks)."""
+        if side == "YES":
+            return "yes_asks" if action == "BUY" else "yes_bids"
+        return "no_asks" if action == "BUY" else "no_bids"
     
     def simulate_fill(
         self,
@@ -119,40 +132,39 @@ class FillModel:
         created_at = datetime.utcnow()
         
         # Get relevant book side
-        if side == "YES":
-            levels = orderbook.yes_asks if action == "BUY" else orderbook.yes_bids
-        else:
-            levels = orderbook.no_asks if action == "BUY" else orderbook.no_bids
+        prices, qtys = orderbook.level_arrays(self._book_side(side, action))
         
         # Apply slippage buffer to limit
-        buffer = self.slippage_buffer_bps / 10000
+        buffer = self._buffer
         adjusted_limit = limit_price + buffer if action == "BUY" else limit_price - buffer
         
-        # Simulate fills
-        fills = []
-        remaining = qty
-        total_value = 0.0
-        total_qty = 0.0
-        
-        for i, level in enumerate(levels):
-            # Check if level is within limit
-            if action == "BUY" and level.price > adjusted_limit:
-                break
-            if action == "SELL" and level.price < adjusted_limit:
-                break
-            
-            fill_qty = min(remaining, level.qty)
-            fills.append((level.price, fill_qty, i))
-            total_value += fill_qty * level.price
-            total_qty += fill_qty
-            remaining -= fill_qty
-            
-            if remaining <= 0:
-                break
+        # Levels are sorted best to worst (asks ascending, bids descending),
+        # so the eligible levels are a prefix found by binary search
+        if action == "BUY":
+            num_eligible = int(np.searchsorted(prices, adjusted_limit, side="right"))
+        else:
+            num_eligible = len(prices) - int(np.searchsorted(prices[::-1], adjusted_limit, side="left"))
+        
+        # Take whole levels until cumulative depth covers qty; the last
+        # level used is only partly taken
+        cum_qty = np.cumsum(qtys[:num_eligible])
+        last = int(np.searchsorted(cum_qty, qty))
+        if last < num_eligible:
+            num_levels = last + 1
+            fill_qtys = qtys[:num_levels].copy()
+            fill_qtys[last] = qty - (cum_qty[last - 1] if last > 0 else 0.0)
+        else:
+            num_levels = num_eligible
+            fill_qtys = qtys[:num_levels]
+        fill_prices = prices[:num_levels]
+        
+        fills = list(zip(fill_prices.tolist(), fill_qtys.tolist(), range(num_levels)))
+        total_value = float(fill_prices @ fill_qtys)
+        total_qty = float(fill_qtys.sum())
         
         # Calculate results
         avg_price = total_value / total_qty if total_qty > 0 else None
-        fee = total_value * (self.fee_bps / 10000) if total_value > 0 else 0
+        fee = total_value * self._fee_rate if total_value > 0 else 0
         
         # Calculate slippage
         slippage_bps = 0
@@ -212,21 +224,14 @@ class FillModel:
         
         Simple heuristic based on book depth.
         """
-        if side == "YES":
-            levels = orderbook.yes_asks if action == "BUY" else orderbook.yes_bids
-        else:
-            levels = orderbook.no_asks if action == "BUY" else orderbook.no_bids
+        prices, qtys = orderbook.level_arrays(self._book_side(side, action))
         
-        if not levels:
+        if not len(prices):
             return 0.0
         
         # Sum available liquidity at or better than limit
-        available = 0.0
-        for level in levels:
-            if action == "BUY" and level.price <= limit_price:
-                available += level.qty
-            elif action == "SELL" and level.price >= limit_price:
-                available += level.qty
+        better = prices <= limit_price if action == "BUY" else prices >= limit_price
+        available = float(qtys[better].sum())
         
         if available >= qty:
             return 1.0
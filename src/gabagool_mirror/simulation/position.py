@@ -9,10 +9,22 @@ from typing import Dict, Optional, Tuple
 from dataclasses import dataclass, field
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Row layout of the ledger's aggregate columns (one row per market)
+POSITION_DTYPE = np.dtype([
+    ("yes_qty", "f8"),
+    ("yes_cost", "f8"),
+    ("no_qty", "f8"),
+    ("no_cost", "f8"),
+    ("realized", "f8"),
+    ("settled", "?"),
+])
+
 
-@dataclass
+@dataclass(slots=True)
 class SimulatedPosition:
     """
     Simulated position for a single market.
@@ -205,6 +217,10 @@ class SimulatedPosition:
 class PositionLedger:
     """
     Ledger tracking all simulated positions.
+    
+    Aggregates gather position quantities into one structured array
+    (one row per market) at read time and reduce it with vectorized
+    operations; the position objects remain the only stored state.
     """
     
     def __init__(self, venue: str):
@@ -220,12 +236,42 @@ class PositionLedger:
     
     def get_or_create(self, market_id: str) -> SimulatedPosition:
         """Get or create position for a market."""
-        if market_id not in self._positions:
-            self._positions[market_id] = SimulatedPosition(
-                market_id=market_id,
-                venue=self.venue
-            )
-        return self._positions[market_id]
+        position = self._positions.get(market_id)
+        if position is None:
+            position = SimulatedPosition(market_id=market_id, venue=self.venue)
+            self._positions[market_id] = position
+        return position
+    
+    def reset(self) -> None:
+        """
+        Clear the ledger for a new run.
+        
+        Positions handed out before the reset keep their state but are
+        no longer tracked.
+        """
+        self._positions.clear()
+        self._total_realized_pnl = 0.0
+    
+    def _columns(self) -> np.ndarray:
+        """Position quantities as a structured array, in insertion order."""
+        return np.array(
+            [
+                (
+                    p.yes_qty,
+                    p.yes_total_cost,
+                    p.no_qty,
+                    p.no_total_cost,
+                    p.realized_pnl,
+                    p.settled_at is not None,
+                )
+                for p in self._positions.values()
+            ],
+            dtype=POSITION_DTYPE,
+        )
+    
+    def _open_mask(self, arr: np.ndarray) -> np.ndarray:
+        """Rows that are unsettled and hold shares."""
+        return ~arr["settled"] & ((arr["yes_qty"] > 0) | (arr["no_qty"] > 0))
     
     def add_fill(
         self,
@@ -295,39 +341,49 @@ class PositionLedger:
     @property
     def total_unrealized_cost(self) -> float:
         """Total cost of unsettled positions."""
-        return sum(
-            p.total_cost for p in self._positions.values()
-            if p.settled_at is None
-        )
+        arr = self._columns()
+        unsettled = ~arr["settled"]
+        return float(arr["yes_cost"][unsettled].sum() + arr["no_cost"][unsettled].sum())
     
     @property
     def total_locked_edge(self) -> float:
         """Total locked edge from hedged positions."""
-        return sum(
-            p.hedge_locked_edge for p in self._positions.values()
-            if p.is_hedged and p.settled_at is None
+        arr = self._columns()
+        hedged = ~arr["settled"] & (arr["yes_qty"] > 0) & (arr["no_qty"] > 0)
+        yes_qty = arr["yes_qty"][hedged]
+        no_qty = arr["no_qty"][hedged]
+        hedged_qty = np.minimum(yes_qty, no_qty)
+        
+        # $1 per pair minus the proportional cost of each side
+        locked_cost = (
+            arr["yes_cost"][hedged] * (hedged_qty / yes_qty)
+            + arr["no_cost"][hedged] * (hedged_qty / no_qty)
         )
+        return float((hedged_qty - locked_cost).sum())
     
     @property
     def open_positions(self) -> Dict[str, SimulatedPosition]:
         """Get all open (unsettled) positions."""
+        is_open = self._open_mask(self._columns())
         return {
-            k: v for k, v in self._positions.items()
-            if v.settled_at is None and (v.yes_qty > 0 or v.no_qty > 0)
+            market_id: position
+            for (market_id, position), open_ in zip(self._positions.items(), is_open)
+            if open_
         }
     
     def get_summary(self) -> dict:
         """Get ledger summary."""
-        open_pos = self.open_positions
+        arr = self._columns()
+        is_open = self._open_mask(arr)
         
         return {
             "venue": self.venue,
             "total_positions": len(self._positions),
-            "open_positions": len(open_pos),
+            "open_positions": int(is_open.sum()),
             "total_realized_pnl": self.total_realized_pnl,
             "total_unrealized_cost": self.total_unrealized_cost,
             "total_locked_edge": self.total_locked_edge,
-            "total_yes_qty": sum(p.yes_qty for p in open_pos.values()),
-            "total_no_qty": sum(p.no_qty for p in open_pos.values()),
+            "total_yes_qty": float(arr["yes_qty"][is_open].sum()),
+            "total_no_qty": float(arr["no_qty"][is_open].sum()),
         }
 
@@ -10,27 +10,23 @@ from ..models.settlement_engine import SettlementEngine
 from ..logger import StructuredLogger
 
 
-@jit(nopython=True)
-def simulate_price_paths(
+@jit(
+    "float64[:, ::1](float64, int64, int64, float64, int64)",
+    nopython=True,
+    cache=True,
+    boundscheck=False
+)
+def _simulate_price_paths(
     current_price: float,
     num_steps: int,
     num_sims: int,
     volatility_per_second: float,
     random_seed: int
 ) -> np.ndarray:
-    """Simulate price paths using geometric Brownian motion.
-    
-    Optimized with Numba for speed.
+    """GBM path kernel behind simulate_price_paths.
     
-    Args:
-        current_price: Starting price
-        num_steps: Number of time steps
-        num_sims: Number of simulations
-        volatility_per_second: 1-second return volatility
-        random_seed: Random seed for reproducibility
-        
-    Returns:
-        Array of shape (num_sims, num_steps) with price paths
+    The explicit signature compiles the kernel eagerly at import and
+    cache=True reuses it across processes, so it only accepts an integer seed.
     """
     np.random.seed(random_seed)
     
@@ -50,6 +46,120 @@ def simulate_price_paths(
     return paths
 
 
+def simulate_price_paths(
+    current_price: float,
+    num_steps: int,
+    num_sims: int,
+    volatility_per_second: float,
+    random_seed: Optional[int] = None
+) -> np.ndarray:
+    """Simulate price paths using geometric Brownian motion.
+    
+    Optimized with Numba for speed.
+    
+    Args:
+        current_price: Starting price
+        num_steps: Number of time steps
+        num_sims: Number of simulations
+        volatility_per_second: 1-second return volatility
+        random_seed: Random seed for reproducibility (None = draw a fresh seed)
+        
+    Returns:
+        Array of shape (num_sims, num_steps) with price paths
+    """
+    if random_seed is None:
+        random_seed = np.random.randint(0, 2**31 - 1)
+    
+    return _simulate_price_paths(
+        float(current_price),
+        int(num_steps),
+        int(num_sims),
+        float(volatility_per_second),
+        int(random_seed)
+    )
+
+
+@jit("float64(float64[::1], float64[::1])", nopython=True, cache=True, boundscheck=False)
+def compute_return_volatility(
+    prices: np.ndarray,
+    timestamps: np.ndarray
+) -> float:
+    """Compute 1-second return volatility from a price series.
+    
+    Args:
+        prices: Array of prices
+        timestamps: Array of timestamps (Unix seconds), same length as prices
+        
+    Returns:
+        Standard deviation of log returns normalized to 1-second intervals;
+        pairs without a positive time step are skipped (NaN if none remain)
+    """
+    n = len(prices) - 1
+    returns_per_second = np.empty(max(n, 0))
+    count = 0
+    
+    for i in range(n):
+        dt = timestamps[i + 1] - timestamps[i]
+        if dt <= 0.0:
+            # Duplicate or out-of-order timestamps carry no time step
+            continue
+        log_return = np.log(prices[i + 1]) - np.log(prices[i])
+        returns_per_second[count] = log_return / np.sqrt(dt)
+        count += 1
+    
+    if count == 0:
+        return np.nan
+    return np.std(returns_per_second[:count])
+
+
+@jit(
+    "float64[::1](float64[:, ::1], float64[::1], int64)",
+    nopython=True,
+    cache=True,
+    boundscheck=False
+)
+def compute_final_avg60s(
+    paths: np.ndarray,
+    current_prices: np.ndarray,
+    seconds_to_settle: int
+) -> np.ndarray:
+    """Compute the settlement avg60 for each simulated price path.
+    
+    Args:
+        paths: Simulated price paths of shape (num_sims, num_steps)
+        current_prices: Prices observed over the last 60 seconds
+        seconds_to_settle: Seconds until settlement
+        
+    Returns:
+        Array of final avg60 values, one per simulation
+    """
+    num_sims = paths.shape[0]
+    final_avg60s = np.zeros(num_sims)
+    
+    if seconds_to_settle >= 60:
+        # After 60 seconds, avg60 is entirely from simulated prices
+        for sim in range(num_sims):
+            final_avg60s[sim] = np.mean(paths[sim, -60:])
+        return final_avg60s
+    
+    # Partial replacement of buffer
+    # Keep (60 - seconds_to_settle) oldest prices, add simulated prices
+    num_keep = 60 - seconds_to_settle
+    old_prices = current_prices[:num_keep]
+    
+    for sim in range(num_sims):
+        new_prices = paths[sim, 1:]  # Skip initial price (current)
+        combined = np.concatenate((old_prices, new_prices))
+        
+        # Take last 60 prices
+        if len(combined) >= 60:
+            final_avg60s[sim] = np.mean(combined[-60:])
+        else:
+            final_avg60s[sim] = np.mean(combined)
+    
+    return final_avg60s
+
+
 class ProbabilityModel:
     """Probability model for computing P(YES) using Monte Carlo simulation."""
     
@@ -97,20 +207,12 @@ class ProbabilityModel:
         if len(ticks) < 60:
             return None
         
-        # Extract prices and timestamps
-        prices = np.array([tick.price for tick in ticks])
-        timestamps = np.array([tick.timestamp for tick in ticks])
-        
-        # Compute log returns
-        log_returns = np.diff(np.log(prices))
-        time_diffs = np.diff(timestamps)
+        # Extract prices and timestamps into contiguous arrays
+        prices = np.fromiter((tick.price for tick in ticks), dtype=np.float64, count=len(ticks))
+        timestamps = np.fromiter((tick.timestamp for tick in ticks), dtype=np.float64, count=len(ticks))
         
-        # Normalize returns to 1-second intervals
-        # return_per_second = log_return / sqrt(time_diff)
-        returns_per_second = log_returns / np.sqrt(time_diffs)
-        
-        # Compute standard deviation
-        volatility = np.std(returns_per_second)
+        # Normalize log returns to 1-second intervals and take std
+        volatility = compute_return_volatility(prices, timestamps)
         
         return float(volatility)
     
@@ -239,34 +341,14 @@ class ProbabilityModel:
         
         # Get current price buffer (last 60 seconds)
         current_buffer = self.brti_feed.get_price_history(duration_seconds=60)
-        current_prices = np.array([tick.price for tick in current_buffer])
+        current_prices = np.fromiter(
+            (tick.price for tick in current_buffer),
+            dtype=np.float64,
+            count=len(current_buffer)
+        )
         
         # For each simulation, compute final avg60
-        final_avg60s = np.zeros(self.num_simulations)
-        
-        for sim in range(self.num_simulations):
-            # Combine current buffer with simulated future prices
-            if seconds_to_settle >= 60:
-                # After 60 seconds, avg60 is entirely from simulated prices
-                # Take last 60 samples from simulation
-                final_avg60s[sim] = np.mean(paths[sim, -60:])
-            else:
-                # Partial replacement of buffer
-                # Keep (60 - seconds_to_settle) oldest prices, add simulated prices
-                num_keep = 60 - seconds_to_settle
-                if len(current_prices) >= num_keep:
-                    old_prices = current_prices[:num_keep]
-                else:
-                    old_prices = current_prices
-                
-                new_prices = paths[sim, 1:]  # Skip initial price (current)
-                combined = np.concatenate([old_prices, new_prices])
-                
-                # Take last 60 prices
-                if len(combined) >= 60:
-                    final_avg60s[sim] = np.mean(combined[-60:])
-                else:
-                    final_avg60s[sim] = np.mean(combined)
+        final_avg60s = compute_final_avg60s(paths, current_prices, seconds_to_settle)
         
         # Compute P(YES) = fraction of simulations where final_avg60 > baseline
         p_yes = np.mean(final_avg60s > baseline)
@@ -3,11 +3,73 @@
 import time
 from typing import Dict, Optional, Tuple
 import numpy as np
+from numba import jit
 
 from ..data.brti_feed import BRTIFeed, PriceTick
 from ..logger import StructuredLogger
 
 
+@jit(
+    "float64(float64[::1], float64[::1], float64, float64)",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False
+)
+def _window_mean(timestamps, prices, start_time, end_time):
+    """Mean price of ticks in [start_time, end_time].
+    
+    Timestamps must be sorted ascending. Scans backwards from the newest tick
+    and stops once ticks are older than the window. Returns NaN if the window
+    has no ticks.
+    """
+    total = 0.0
+    count = 0
+    for i in range(timestamps.shape[0] - 1, -1, -1):
+        ts = timestamps[i]
+        if ts < start_time:
+            break
+        if ts <= end_time:
+            total += prices[i]
+            count += 1
+    if count == 0:
+        return np.nan
+    return total / count
+
+
+@jit(
+    "UniTuple(float64, 2)(float64[::1], float64[::1], float64, float64, float64)",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False
+)
+def _window_means_ab(timestamps, prices, start_time, end_a, end_b):
+    """Means over [start_time, end_a] (A) and [start_time, end_b] (B) in one scan.
+    
+    Timestamps must be sorted ascending and end_a must not exceed end_b.
+    Either mean is NaN if its window is empty.
+    """
+    total_a = 0.0
+    total_b = 0.0
+    count_a = 0
+    count_b = 0
+    for i in range(timestamps.shape[0] - 1, -1, -1):
+        ts = timestamps[i]
+        if ts < start_time:
+            break
+        price = prices[i]
+        if ts <= end_a:
+            total_a += price
+            count_a += 1
+        if ts <= end_b:
+            total_b += price
+            count_b += 1
+    avg_a = total_a / count_a if count_a > 0 else np.nan
+    avg_b = total_b / count_b if count_b > 0 else np.nan
+    return avg_a, avg_b
+
+
 class SettlementEngine:
     """Settlement window engine.
     
@@ -37,9 +99,45 @@ class SettlementEngine:
         self.avg60_b: Optional[float] = None  # (T-60, T]
         self.last_update: Optional[float] = None
         
+        # Tick buffer as (timestamps, prices) arrays, rebuilt when it changes
+        self._tick_arrays: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._tick_arrays_key: Optional[Tuple] = None
+        
         # Logging
         self.logger = StructuredLogger(__name__)
     
+    def _get_tick_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Get the feed's price buffer as contiguous timestamp/price arrays.
+        
+        The arrays are cached until the buffer's length or end ticks change,
+        so several averages computed for one tick share a single conversion.
+        Ticks are sorted by timestamp if they arrived out of order.
+        """
+        buffer = self.brti_feed.price_buffer
+        key = (len(buffer), buffer[0].timestamp, buffer[-1].timestamp) if buffer else (0,)
+        
+        if key != self._tick_arrays_key:
+            n = len(buffer)
+            timestamps = np.fromiter((tick.timestamp for tick in buffer), dtype=np.float64, count=n)
+            prices = np.fromiter((tick.price for tick in buffer), dtype=np.float64, count=n)
+            if n > 1 and (timestamps[1:] < timestamps[:-1]).any():
+                order = np.argsort(timestamps, kind="stable")
+                timestamps = timestamps[order]
+                prices = prices[order]
+            self._tick_arrays = (timestamps, prices)
+            self._tick_arrays_key = key
+        
+        return self._tick_arrays
+    
+    def _average(self, start_time: float, end_time: float) -> Optional[float]:
+        """Average price over [start_time, end_time] or None if no ticks.
+        
+        Matches the feed's compute_simple_average window edges.
+        """
+        timestamps, prices = self._get_tick_arrays()
+        avg = _window_mean(timestamps, prices, start_time, end_time)
+        return None if np.isnan(avg) else float(avg)
+    
     def compute_avg60_for_timestamp(
         self,
         settle_timestamp: float,
@@ -66,29 +164,37 @@ class SettlementEngine:
             start_time = settle_timestamp - 60
             end_time = settle_timestamp
         
-        return self.brti_feed.compute_simple_average(start_time, end_time)
+        return self._average(start_time, end_time)
     
-    def compute_rolling_avg60(self) -> Tuple[Optional[float], Optional[float]]:
+    def compute_rolling_avg60(
+        self,
+        current_time: Optional[float] = None
+    ) -> Tuple[Optional[float], Optional[float]]:
         """Compute rolling 60-second averages (both conventions).
         
+        Args:
+            current_time: Window end (Unix seconds, None = now)
+            
         Returns:
             Tuple of (avg60_a, avg60_b) or (None, None) if insufficient data
         """
-        current_time = time.time()
+        if current_time is None:
+            current_time = time.time()
+        timestamps, prices = self._get_tick_arrays()
         
-        # Convention A: [T-60, T-1]
-        avg60_a = self.brti_feed.compute_simple_average(
-            current_time - 60,
-            current_time - 1
-        )
-        
-        # Convention B: (T-60, T]
-        avg60_b = self.brti_feed.compute_simple_average(
+        # Both windows start at T-60; A ends at T-1 and B at T, in one scan
+        avg60_a, avg60_b = _window_means_ab(
+            timestamps,
+            prices,
             current_time - 60,
+            current_time - 1,
             current_time
         )
         
-        return avg60_a, avg60_b
+        return (
+            None if np.isnan(avg60_a) else float(avg60_a),
+            None if np.isnan(avg60_b) else float(avg60_b)
+        )
     
     def update(self) -> None:
         """Update rolling averages."""
@@ -162,7 +268,8 @@ class SettlementEngine:
             volatility_per_second: 1-second return volatility
             
         Returns:
-            Tuple of (min_possible_avg60, max_possible_avg60)
+            Tuple of (min_possible_avg60, max_possible_avg60); arguments may
+            also be NumPy arrays, giving arrays of bounds
         """
         # This is conservative: assume price could move by N standard deviations
         # in the remaining time
@@ -176,7 +283,7 @@ class SettlementEngine:
         
         # Simplified: if we have S seconds remaining, worst case is price
         # moves immediately and stays there, affecting up to min(S, 60) samples
-        samples_affected = min(seconds_remaining, 60)
+        samples_affected = np.minimum(seconds_remaining, 60)
         
         # Maximum price movement in remaining time
         price_volatility = current_avg60 * volatility_per_second * np.sqrt(seconds_remaining)
@@ -231,6 +338,45 @@ class SettlementEngine:
         
         return None
     
+    def is_outcome_locked_batch(
+        self,
+        baselines: np.ndarray,
+        seconds_remaining: np.ndarray,
+        volatility_per_second: np.ndarray,
+        current_avg60: Optional[float] = None
+    ) -> Optional[np.ndarray]:
+        """Check outcome locks for many markets at once.
+        
+        Same rule as is_outcome_locked, evaluated with array operations.
+        
+        Args:
+            baselines: Baseline price per market
+            seconds_remaining: Seconds until settlement (scalar or per market)
+            volatility_per_second: 1-second return volatility (scalar or per market)
+            current_avg60: avg60 to test against (None = current avg60)
+            
+        Returns:
+            int8 array with 1 for locked YES, 0 for locked NO and -1 for not
+            locked, or None if no avg60 is available
+        """
+        if current_avg60 is None:
+            current_avg60 = self.get_current_avg60()
+            if current_avg60 is None:
+                return None
+        
+        baselines = np.asarray(baselines, dtype=np.float64)
+        min_possible, max_possible = self.compute_max_movement_bounds(
+            np.asarray(seconds_remaining, dtype=np.float64),
+            current_avg60,
+            np.asarray(volatility_per_second, dtype=np.float64)
+        )
+        
+        # Same strict comparisons as the scalar check, so NaN bounds stay -1
+        locked = np.full(np.broadcast(baselines, min_possible).shape, -1, dtype=np.int8)
+        locked[max_possible < baselines] = 0
+        locked[min_possible > baselines] = 1
+        return locked
+    
     def get_status(self) -> Dict:
         """Get settlement engine status.
         
@@ -100,6 +100,11 @@ class RiskManager:
         self.peak_bankroll = initial_bankroll_usd
         self.trades: List[Trade] = []
         self.open_trades: List[Trade] = []
+        self._open_exposure = 0.0  # Running sum of open trade sizes
+        
+        # Realized PnL of closed trades, in close order (grown geometrically)
+        self._pnls = np.empty(1024, dtype=np.float64)
+        self._pnl_n = 0
         
         # Circuit breaker state
         self.is_halted = False
@@ -141,7 +146,7 @@ class RiskManager:
         Returns:
             Total USD exposure in open positions
         """
-        return sum(trade.size_usd for trade in self.open_trades)
+        return self._open_exposure
     
     def get_available_risk_budget(self) -> float:
         """Get available risk budget for new trade.
@@ -300,6 +305,7 @@ class RiskManager:
         
         self.trades.append(trade)
         self.open_trades.append(trade)
+        self._open_exposure += size_usd
         
         self.logger.info(
             f"Opened position: {side} {market_id}",
@@ -324,9 +330,11 @@ class RiskManager:
         
         if trade in self.open_trades:
             self.open_trades.remove(trade)
+            self._open_exposure -= trade.size_usd
         
         # Update tracking
         if trade.pnl is not None:
+            self._record_pnl(trade.pnl)
             self.daily_pnl += trade.pnl
             self.current_bankroll += trade.pnl
             
@@ -354,6 +362,20 @@ class RiskManager:
             if breaker_reason:
                 self.halt(breaker_reason)
     
+    def _record_pnl(self, pnl: float) -> None:
+        """Append a closed trade's PnL to the metrics array.
+        
+        Args:
+            pnl: Realized PnL
+        """
+        if self._pnl_n == len(self._pnls):
+            grown = np.empty(2 * len(self._pnls), dtype=np.float64)
+            grown[:self._pnl_n] = self._pnls
+            self._pnls = grown
+        
+        self._pnls[self._pnl_n] = pnl
+        self._pnl_n += 1
+    
     def halt(self, reason: str) -> None:
         """Halt trading.
         
@@ -386,15 +408,16 @@ class RiskManager:
         Returns:
             Metrics dictionary
         """
-        closed_trades = [t for t in self.trades if not t.is_open()]
+        pnls = self._pnls[:self._pnl_n]
         
-        if closed_trades:
-            pnls = [t.pnl for t in closed_trades if t.pnl is not None]
+        if self._pnl_n:
+            wins = pnls[pnls > 0]
+            losses = pnls[pnls < 0]
             
-            total_pnl = sum(pnls)
-            win_rate = sum(1 for pnl in pnls if pnl > 0) / len(pnls) if pnls else 0
-            avg_win = np.mean([pnl for pnl in pnls if pnl > 0]) if any(pnl > 0 for pnl in pnls) else 0
-            avg_loss = np.mean([pnl for pnl in pnls if pnl < 0]) if any(pnl < 0 for pnl in pnls) else 0
+            total_pnl = float(pnls.sum())
+            win_rate = len(wins) / self._pnl_n
+            avg_win = float(wins.mean()) if len(wins) else 0
+            avg_loss = float(losses.mean()) if len(losses) else 0
         else:
             total_pnl = 0
             win_rate = 0
@@ -9,14 +9,20 @@ This simulates real trading with the prediction engine, tracking:
 - Prediction calibration
 """
 
-import asyncio
 import pandas as pd
 import numpy as np
-from datetime import datetime
 import sys
+import time
 from pathlib import Path
 from collections import deque
 
+# Faster CSV parsing and Parquet output when pyarrow is available
+try:
+    import pyarrow  # noqa: F401
+    PYARROW = True
+except ImportError:
+    PYARROW = False
+
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
@@ -29,6 +35,30 @@ from src.logger import setup_logging, StructuredLogger
 logger = StructuredLogger(__name__)
 
 
+# Outcome codes (1 = YES, 0 = NO) are written out as labels
+OUTCOME_LABELS = ("NO", "YES")
+_LABEL_COLUMNS = ('actual_outcome', 'predicted_outcome', 'side', 'outcome')
+
+
+def save_results(df, path_stem):
+    """Save a results frame as Parquet (pyarrow) or CSV, returning the path.
+    
+    Outcome-code columns are saved as YES/NO labels.
+    """
+    codes = {code: label for code, label in enumerate(OUTCOME_LABELS)}
+    df = df.assign(**{
+        col: df[col].map(codes) for col in _LABEL_COLUMNS if col in df.columns
+    })
+    
+    if PYARROW:
+        path = f"{path_stem}.parquet"
+        df.to_parquet(path, index=False)
+    else:
+        path = f"{path_stem}.csv"
+        df.to_csv(path, index=False)
+    return path
+
+
 class VirtualWallet:
     """Virtual wallet for tracking trades and P&L."""
     
@@ -37,10 +67,20 @@ class VirtualWallet:
         self.balance = initial_balance
         self.peak_balance = initial_balance
         self.trades = []
-        self.open_positions = []
+        self.open_positions: dict[str, dict] = {}
+        
+        # Running trade statistics (updated on close)
+        self._wins = 0
+        self._losses = 0
+        self._pnl_sum = 0.0
+        self._win_pnl_sum = 0.0
+        self._loss_pnl_sum = 0.0
     
-    def open_position(self, market_id, side, size, entry_price, p_true, edge):
-        """Open a new position."""
+    def open_position(self, market_id, side, size, entry_price, p_true, edge, open_time=None):
+        """Open a new position.
+        
+        side is an outcome code (1 = YES, 0 = NO). open_time is the simulated timestamp (Unix seconds); defaults to now.
+        """
         if size > self.balance:
             return None  # Can't afford
         
@@ -51,19 +91,22 @@ class VirtualWallet:
             'entry_price': entry_price,
             'p_true': p_true,
             'edge': edge,
-            'open_time': datetime.now(),
+            'open_time': open_time if open_time is not None else time.time(),
             'status': 'open'
         }
         
-        self.open_positions.append(position)
+        self.open_positions[market_id] = position
         # Deduct from balance (margin)
         self.balance -= size
         
         return position
     
-    def close_position(self, position, outcome):
-        """Close a position with the actual outcome."""
-        position['close_time'] = datetime.now()
+    def close_position(self, position, outcome, close_time=None):
+        """Close a position with the actual outcome (1 = YES, 0 = NO).
+        
+        close_time is the simulated timestamp (Unix seconds); defaults to now.
+        """
+        position['close_time'] = close_time if close_time is not None else time.time()
         position['outcome'] = outcome
         position['won'] = (position['side'] == outcome)
         
@@ -81,13 +124,22 @@ class VirtualWallet:
         
         position['status'] = 'closed'
         
+        # Update running stats
+        self._pnl_sum += position['pnl']
+        if position['won']:
+            self._wins += 1
+            self._win_pnl_sum += position['pnl']
+        else:
+            self._losses += 1
+            self._loss_pnl_sum += position['pnl']
+        
         # Update peak
         if self.balance > self.peak_balance:
             self.peak_balance = self.balance
         
         # Move to trades history
         self.trades.append(position)
-        self.open_positions.remove(position)
+        del self.open_positions[position['market_id']]
         
         return position
     
@@ -104,11 +156,14 @@ class VirtualWallet:
                 'total_pnl': 0,
                 'roi': 0,
                 'drawdown': 0,
-                'peak_balance': self.peak_balance
+                'peak_balance': self.peak_balance,
+                'avg_win': 0,
+                'avg_loss': 0,
+                'avg_trade': 0
             }
         
-        wins = sum(1 for t in self.trades if t['won'])
-        total_pnl = sum(t['pnl'] for t in self.trades)
+        wins = self._wins
+        total_pnl = self._pnl_sum
         roi = (self.balance - self.initial_balance) / self.initial_balance
         drawdown = (self.peak_balance - self.balance) / self.peak_balance if self.peak_balance > 0 else 0
         
@@ -117,16 +172,19 @@ class VirtualWallet:
             'initial': self.initial_balance,
             'total_trades': len(self.trades),
             'wins': wins,
-            'losses': len(self.trades) - wins,
-            'win_rate': wins / len(self.trades),
+            'losses': self._losses,
+            'win_rate': wins / (wins + self._losses),
             'total_pnl': total_pnl,
             'roi': roi,
             'drawdown': drawdown,
-            'peak_balance': self.peak_balance
+            'peak_balance': self.peak_balance,
+            'avg_win': self._win_pnl_sum / wins if wins else 0,
+            'avg_loss': self._loss_pnl_sum / self._losses if self._losses else 0,
+            'avg_trade': total_pnl / (wins + self._losses)
         }
 
 
-async def run_live_simulation():
+def run_live_simulation():
     """Run live simulation with virtual wallet."""
     
     print("=" * 80)
@@ -148,7 +206,12 @@ async def run_live_simulation():
     # Load data
     print("📊 Loading Bitcoin price data...")
     try:
-        df = pd.read_csv('data/btc_1min.csv')
+        df = pd.read_csv(
+            'data/btc_1min.csv',
+            usecols=['timestamp', 'price'],
+            dtype={'timestamp': 'float64', 'price': 'float64'},
+            engine="pyarrow" if PYARROW else "c"
+        )
         print(f"   ✓ Loaded {len(df):,} 1-minute data points")
         print(f"   ✓ Price range: ${df['price'].min():,.2f} - ${df['price'].max():,.2f}")
     except Exception as e:
@@ -189,9 +252,6 @@ async def run_live_simulation():
     min_edge_threshold = 0.03  # 3% minimum edge
     max_position_size = 8.0    # $8 max per trade
     
-    # Track results
-    predictions = []
-    
     print("🎮 Starting simulation...")
     print("=" * 80)
     print()
@@ -199,154 +259,146 @@ async def run_live_simulation():
     # Simulate 15-minute intervals
     num_intervals = min(100, (len(df) - 100) // interval_minutes)
     
-    for interval_num in range(num_intervals):
-        # Get data window
-        start_idx = interval_num * interval_minutes
-        warmup_start = max(0, start_idx - 90)  # 90 minutes of warmup
-        interval_end = start_idx + interval_minutes
+    # Track results (one slot per interval, filled in prediction order)
+    # Outcomes and sides are stored as codes: 1 = YES, 0 = NO
+    n_predictions = 0
+    interval_arr = np.empty(num_intervals, dtype=np.int64)
+    baseline_arr = np.empty(num_intervals)
+    final_price_arr = np.empty(num_intervals)
+    actual_outcome_arr = np.empty(num_intervals, dtype=np.int8)
+    p_yes_arr = np.empty(num_intervals)
+    p_no_arr = np.empty(num_intervals)
+    predicted_outcome_arr = np.empty(num_intervals, dtype=np.int8)
+    confidence_arr = np.empty(num_intervals)
+    correct_arr = np.empty(num_intervals, dtype=bool)
+    edge_arr = np.empty(num_intervals)
+    traded_arr = np.empty(num_intervals, dtype=bool)
+    pnl_arr = np.empty(num_intervals)
+    
+    # Simulated market noise, drawn once for all intervals
+    rng = np.random.default_rng(42)
+    noise = rng.normal(0, 0.05, size=num_intervals)
+    market_noise = np.clip(0.50 + noise, 0.01, 0.99)
+    
+    # Column arrays for indexing inside the loop
+    ts_arr = df['timestamp'].to_numpy()
+    price_arr = df['price'].to_numpy()
+    
+    # Interval boundaries; predictions are made 10 minutes in
+    # (5 minutes before settlement)
+    starts = np.arange(num_intervals) * interval_minutes
+    ends = starts + interval_minutes
+    prediction_points = starts + 10
+    baselines = price_arr[starts]
+    finals = price_arr[ends - 1]
+    
+    # Need 60 data points before the prediction point and positive prices
+    valid_mask = (
+        (ends < len(df))
+        & (prediction_points >= 60)
+        & (baselines > 0)
+        & (finals > 0)
+    )
+    
+    for interval_num in np.nonzero(valid_mask)[0].tolist():
+        start_idx = starts[interval_num]
+        interval_end = ends[interval_num]
+        prediction_point = prediction_points[interval_num]
         
-        if interval_end >= len(df):
-            break
+        baseline = baselines[interval_num]
+        final_price = finals[interval_num]
+        actual_outcome = int(final_price > baseline)
         
-        # Clear and populate buffer
+        # Populate buffer up to prediction point
         brti_feed.price_buffer.clear()
-        
-        warmup_data = df.iloc[warmup_start:start_idx]
-        interval_data = df.iloc[start_idx:interval_end]
-        
-        # Add warmup data
-        for _, row in warmup_data.iterrows():
+        window = slice(max(0, prediction_point - 90), prediction_point)
+        for timestamp, price in zip(ts_arr[window], price_arr[window]):
             tick = PriceTick(
-                timestamp=row['timestamp'],
-                price=row['price'],
+                timestamp=timestamp,
+                price=price,
                 source="simulation"
             )
             brti_feed.price_buffer.append(tick)
         
-        # Baseline
-        baseline = interval_data.iloc[0]['price']
-        interval_start_time = interval_data.iloc[0]['timestamp']
-        
-        # Add interval data point by point (simulate real-time)
-        for idx, row in interval_data.iterrows():
-            tick = PriceTick(
-                timestamp=row['timestamp'],
-                price=row['price'],
-                source="simulation"
-            )
-            brti_feed.price_buffer.append(tick)
+        # Make prediction
+        settle_time = ts_arr[interval_end - 1]
         
-        # Final price (settlement)
-        final_price = interval_data.iloc[-1]['price']
-        actual_outcome = "YES" if final_price > baseline else "NO"
+        p_yes, p_no = prob_model.compute_probability(
+            baseline=baseline,
+            settle_timestamp=settle_time
+        )
         
-        # Need at least 60 data points
-        if len(brti_feed.price_buffer) < 60:
+        if p_yes is None:
             continue
         
-        # Get current state (as if we're X minutes into the interval)
-        # Let's make prediction at 10 minutes in (5 minutes before settlement)
-        prediction_point = start_idx + 10
-        if prediction_point >= len(df):
-            continue
+        # Determine prediction and confidence
+        predicted_outcome = int(p_yes > 0.5)
+        confidence = abs(p_yes - 0.5)
         
-        # Populate buffer up to prediction point
-        brti_feed.price_buffer.clear()
-        for _, row in df.iloc[max(0, prediction_point - 90):prediction_point].iterrows():
-            tick = PriceTick(
-                timestamp=row['timestamp'],
-                price=row['price'],
-                source="simulation"
-            )
-            brti_feed.price_buffer.append(tick)
+        # Simulate market price (assume market is at 50-50 initially)
+        # In reality, this would come from Kalshi orderbook
+        market_price_yes = float(market_noise[interval_num])  # Some noise
         
-        if len(brti_feed.price_buffer) < 60:
-            continue
+        # Calculate edge
+        edge_yes = p_yes - market_price_yes - 0.015  # After fees/costs
+        edge_no = p_no - (1 - market_price_yes) - 0.015
         
-        # Make prediction
-        settle_time = interval_data.iloc[-1]['timestamp']
+        best_edge = max(edge_yes, edge_no)
+        best_side = int(edge_yes > edge_no)
         
-        try:
-            p_yes, p_no = prob_model.compute_probability(
-                baseline=baseline,
-                settle_timestamp=settle_time
-            )
-            
-            if p_yes is None:
-                continue
-            
-            # Determine prediction and confidence
-            predicted_outcome = "YES" if p_yes > 0.5 else "NO"
-            confidence = abs(p_yes - 0.5)
-            
-            # Simulate market price (assume market is at 50-50 initially)
-            # In reality, this would come from Kalshi orderbook
-            market_price_yes = 0.50 + np.random.normal(0, 0.05)  # Some noise
-            market_price_yes = np.clip(market_price_yes, 0.01, 0.99)
-            
-            # Calculate edge
-            edge_yes = p_yes - market_price_yes - 0.015  # After fees/costs
-            edge_no = p_no - (1 - market_price_yes) - 0.015
-            
-            best_edge = max(edge_yes, edge_no)
-            best_side = "YES" if edge_yes > edge_no else "NO"
+        # Trading decision
+        should_trade = best_edge >= min_edge_threshold and confidence > 0.05
+        
+        trade_executed = None
+        
+        if should_trade and wallet.balance >= max_position_size:
+            # Calculate position size based on edge
+            size = min(max_position_size, wallet.balance * 0.04)  # 4% of bankroll
+            size = size * min(1.0, best_edge / 0.05)  # Scale with edge
             
-            # Trading decision
-            should_trade = best_edge >= min_edge_threshold and confidence > 0.05
+            # Execute trade
+            entry_price = market_price_yes if best_side else (1 - market_price_yes)
             
-            trade_executed = None
+            position = wallet.open_position(
+                market_id=f"INTERVAL-{interval_num}",
+                side=best_side,
+                size=size,
+                entry_price=entry_price,
+                p_true=p_yes if best_side else p_no,
+                edge=best_edge,
+                open_time=ts_arr[start_idx]
+            )
             
-            if should_trade and wallet.balance >= max_position_size:
-                # Calculate position size based on edge
-                size = min(max_position_size, wallet.balance * 0.04)  # 4% of bankroll
-                size = size * min(1.0, best_edge / 0.05)  # Scale with edge
-                
-                # Execute trade
-                entry_price = market_price_yes if best_side == "YES" else (1 - market_price_yes)
-                
-                position = wallet.open_position(
-                    market_id=f"INTERVAL-{interval_num}",
-                    side=best_side,
-                    size=size,
-                    entry_price=entry_price,
-                    p_true=p_yes if best_side == "YES" else p_no,
-                    edge=best_edge
-                )
+            if position:
+                trade_executed = position
                 
-                if position:
-                    trade_executed = position
-                    
-                    # Close position immediately with actual outcome
-                    wallet.close_position(position, actual_outcome)
-            
-            # Record prediction
-            predictions.append({
-                'interval': interval_num,
-                'baseline': baseline,
-                'final_price': final_price,
-                'actual_outcome': actual_outcome,
-                'p_yes': p_yes,
-                'p_no': p_no,
-                'predicted_outcome': predicted_outcome,
-                'confidence': confidence,
-                'correct': predicted_outcome == actual_outcome,
-                'edge': best_edge,
-                'traded': trade_executed is not None,
-                'pnl': trade_executed['pnl'] if trade_executed else 0
-            })
-            
-            # Print progress every 10 intervals
-            if (interval_num + 1) % 10 == 0:
-                stats = wallet.get_stats()
-                print(f"Interval {interval_num + 1}/{num_intervals} | "
-                      f"Balance: ${stats['balance']:.2f} | "
-                      f"Trades: {stats['total_trades']} | "
-                      f"Win Rate: {stats['win_rate']:.1%} | "
-                      f"P&L: ${stats['total_pnl']:+.2f}")
-            
-        except Exception as e:
-            logger.debug(f"Error in interval {interval_num}: {e}")
-            continue
+                # Close position immediately with actual outcome
+                wallet.close_position(position, actual_outcome, close_time=settle_time)
+        
+        # Record prediction
+        i = n_predictions
+        interval_arr[i] = interval_num
+        baseline_arr[i] = baseline
+        final_price_arr[i] = final_price
+        actual_outcome_arr[i] = actual_outcome
+        p_yes_arr[i] = p_yes
+        p_no_arr[i] = p_no
+        predicted_outcome_arr[i] = predicted_outcome
+        confidence_arr[i] = confidence
+        correct_arr[i] = predicted_outcome == actual_outcome
+        edge_arr[i] = best_edge
+        traded_arr[i] = trade_executed is not None
+        pnl_arr[i] = trade_executed['pnl'] if trade_executed else 0
+        n_predictions += 1
+        
+        # Print progress every 10 intervals
+        if (interval_num + 1) % 10 == 0:
+            stats = wallet.get_stats()
+            print(f"Interval {interval_num + 1}/{num_intervals} | "
+                  f"Balance: ${stats['balance']:.2f} | "
+                  f"Trades: {stats['total_trades']} | "
+                  f"Win Rate: {stats['win_rate']:.1%} | "
+                  f"P&L: ${stats['total_pnl']:+.2f}")
     
     print()
     print("=" * 80)
@@ -375,18 +427,28 @@ async def run_live_simulation():
     print(f"Win Rate:            {stats['win_rate']:.2%}")
     
     if wallet.trades:
-        avg_win = np.mean([t['pnl'] for t in wallet.trades if t['won']])
-        avg_loss = np.mean([t['pnl'] for t in wallet.trades if not t['won']])
-        avg_trade = np.mean([t['pnl'] for t in wallet.trades])
-        
-        print(f"Average Win:         ${avg_win:+.2f}")
-        print(f"Average Loss:        ${avg_loss:+.2f}")
-        print(f"Average Trade:       ${avg_trade:+.2f}")
+        print(f"Average Win:         ${stats['avg_win']:+.2f}")
+        print(f"Average Loss:        ${stats['avg_loss']:+.2f}")
+        print(f"Average Trade:       ${stats['avg_trade']:+.2f}")
     print()
     
     # Prediction accuracy
-    if predictions:
-        pred_df = pd.DataFrame(predictions)
+    if n_predictions:
+        n = n_predictions
+        pred_df = pd.DataFrame({
+            'interval': interval_arr[:n],
+            'baseline': baseline_arr[:n],
+            'final_price': final_price_arr[:n],
+            'actual_outcome': actual_outcome_arr[:n],
+            'p_yes': p_yes_arr[:n],
+            'p_no': p_no_arr[:n],
+            'predicted_outcome': predicted_outcome_arr[:n],
+            'confidence': confidence_arr[:n],
+            'correct': correct_arr[:n],
+            'edge': edge_arr[:n],
+            'traded': traded_arr[:n],
+            'pnl': pnl_arr[:n]
+        })
         
         print("🎯 PREDICTION ACCURACY")
         print("-" * 80)
@@ -397,7 +459,7 @@ async def run_live_simulation():
         # Brier score
         brier_scores = []
         for _, row in pred_df.iterrows():
-            actual = 1.0 if row['actual_outcome'] == "YES" else 0.0
+            actual = float(row['actual_outcome'])
             brier_scores.append((row['p_yes'] - actual) ** 2)
         
         brier_score = np.mean(brier_scores)
@@ -408,16 +470,22 @@ async def run_live_simulation():
         print("📊 ACCURACY BY CONFIDENCE LEVEL")
         print("-" * 80)
         
-        high_conf = pred_df[pred_df['confidence'] > 0.15]
-        med_conf = pred_df[(pred_df['confidence'] > 0.05) & (pred_df['confidence'] <= 0.15)]
-        low_conf = pred_df[pred_df['confidence'] <= 0.05]
+        conf_bins = pd.cut(
+            pred_df['confidence'],
+            bins=[-np.inf, 0.05, 0.15, np.inf],
+            labels=['low', 'med', 'high']
+        )
+        conf_summary = pred_df.groupby(conf_bins, observed=True)['correct'].agg(['size', 'mean'])
         
-        if len(high_conf) > 0:
-            print(f"High (>0.15):        {len(high_conf):3d} predictions, {high_conf['correct'].mean():.1%} accurate")
-        if len(med_conf) > 0:
-            print(f"Medium (0.05-0.15):  {len(med_conf):3d} predictions, {med_conf['correct'].mean():.1%} accurate")
-        if len(low_conf) > 0:
-            print(f"Low (<0.05):         {len(low_conf):3d} predictions, {low_conf['correct'].mean():.1%} accurate")
+        if 'high' in conf_summary.index:
+            high = conf_summary.loc['high']
+            print(f"High (>0.15):        {int(high['size']):3d} predictions, {high['mean']:.1%} accurate")
+        if 'med' in conf_summary.index:
+            med = conf_summary.loc['med']
+            print(f"Medium (0.05-0.15):  {int(med['size']):3d} predictions, {med['mean']:.1%} accurate")
+        if 'low' in conf_summary.index:
+            low = conf_summary.loc['low']
+            print(f"Low (<0.05):         {int(low['size']):3d} predictions, {low['mean']:.1%} accurate")
         print()
         
         # Trade analysis
@@ -432,15 +500,14 @@ async def run_live_simulation():
             print()
     
     # Save detailed results
-    if predictions:
-        results_df = pd.DataFrame(predictions)
-        results_df.to_csv('logs/virtual_wallet_test.csv', index=False)
-        print(f"✓ Detailed results saved to: logs/virtual_wallet_test.csv")
+    if n_predictions:
+        path = save_results(pred_df, 'logs/virtual_wallet_test')
+        print(f"✓ Detailed results saved to: {path}")
     
     if wallet.trades:
         trades_df = pd.DataFrame(wallet.trades)
-        trades_df.to_csv('logs/virtual_wallet_trades.csv', index=False)
-        print(f"✓ Trade history saved to: logs/virtual_wallet_trades.csv")
+        path = save_results(trades_df, 'logs/virtual_wallet_trades')
+        print(f"✓ Trade history saved to: {path}")
     
     print()
     print("=" * 80)
@@ -461,7 +528,7 @@ async def run_live_simulation():
     else:
         print(f"❌ UNPROFITABLE: {stats['roi']:+.1%} return - System needs improvement")
     
-    if predictions:
+    if n_predictions:
         accuracy = pred_df['correct'].mean()
         if accuracy > 0.60:
             print(f"🎯 STRONG PREDICTIONS: {accuracy:.1%} accuracy (well above 50%)")
@@ -476,5 +543,5 @@ async def run_live_simulation():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_live_simulation())
+    run_live_simulation()
 
@@ -7,13 +7,308 @@ Uses a simpler but more robust prediction model for historical data testing.
 
 import pandas as pd
 import numpy as np
-from datetime import datetime
+from dataclasses import dataclass
+from typing import Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from numba import jit, prange, set_num_threads
 import sys
+import time
 from pathlib import Path
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+# One row per prediction (also the predictions CSV column order)
+PREDICTION_DTYPE = np.dtype([
+    ('interval', 'i8'),
+    ('baseline', 'f8'),
+    ('final_price', 'f8'),
+    ('actual_outcome', 'U3'),
+    ('p_yes', 'f8'),
+    ('p_no', 'f8'),
+    ('predicted_outcome', 'U3'),
+    ('confidence', 'f8'),
+    ('correct', '?'),
+    ('market_price', 'f8'),
+    ('edge', 'f8'),
+    ('traded', '?'),
+    ('pnl', 'f8'),
+])
+
+# Parameter sweep: columns of the params matrix and of the result matrix
+SWEEP_PARAMS = ('initial_balance', 'max_position_size', 'min_edge')
+SWEEP_METRICS = ('final_balance', 'peak_balance', 'trades', 'wins', 'total_pnl')
+
+# Side/outcome codes are 1 for YES and 0 for NO; index this to label them
+OUTCOME_LABELS = ("NO", "YES")
+
+# Brier score rating: scores below each cut get the label at that position
+_BRIER_CUT = np.array([0.15, 0.20, 0.25])
+_BRIER_LABEL = ('EXCELLENT', 'GOOD', 'FAIR', 'POOR')
+
+# Faster CSV ingest when polars is available
+try:
+    import polars as pl
+    POLARS = True
+except ImportError:
+    POLARS = False
+
+
+@jit(
+    "float64(float64, float64, float64, float64, float64, float64, float64)",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False
+)
+def _score(current, baseline, mom_5min, mom_10min, mom_15min,
+           trend_strength, volatility):
+    """Combine the momentum, trend and volatility features into P(YES)."""
+    # Distance from baseline
+    baseline_gap = (current - baseline) / baseline
+    
+    # Calculate probability
+    p_yes = 0.5
+    
+    # Strong momentum component
+    momentum_signal = (0.5 * mom_5min + 0.3 * mom_10min + 0.2 * mom_15min)
+    p_yes += momentum_signal * 50.0  # Amplify momentum
+    
+    # Trend continuation (if in strong trend, expect continuation)
+    p_yes += trend_strength * 0.15
+    
+    # Position relative to baseline
+    # If we're above baseline and moving up, more likely to stay up
+    if current > baseline and momentum_signal > 0:
+        p_yes += 0.08
+    elif current < baseline and momentum_signal < 0:
+        p_yes -= 0.08
+    
+    # Mean reversion for extreme moves
+    if abs(baseline_gap) > 0.02:  # 2% from baseline
+        p_yes -= baseline_gap * 5.0  # Revert to mean
+    
+    # Volatility dampens extreme predictions slightly
+    dampening = 1 - (volatility * 1000)  # Scale volatility
+    dampening = min(max(dampening, 0.7), 1.0)
+    
+    return 0.5 + (p_yes - 0.5) * dampening
+
+
+@jit(
+    "float64(float64[::1], float64)",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False
+)
+def _predict_core(prices, baseline):
+    """Compute the unclipped P(YES) from at least 60 minutes of prices.
+    
+    Compiled with Numba; features are computed in a single loop so the
+    whole prediction runs without leaving native code.
+    """
+    n = prices.shape[0]
+    current = prices[n - 1]
+    
+    # Recent momentum (last 5, 10 and 15 minutes)
+    mom_5min = current / prices[n - 5] - 1.0
+    mom_10min = current / prices[n - 10] - 1.0
+    mom_15min = current / prices[n - 15] - 1.0
+    
+    # One pass over the last 59 one-minute returns: Welford running
+    # mean/variance for volatility, and the up/down count of the last 14
+    # moves for trend strength
+    ret_mean = 0.0
+    ret_m2 = 0.0
+    trend_score = 0
+    for k in range(1, 60):
+        i = n - 60 + k
+        r = prices[i] / prices[i - 1] - 1.0
+        delta = r - ret_mean
+        ret_mean += delta / k
+        ret_m2 += (r - ret_mean) * delta
+        if k >= 46:
+            if prices[i] > prices[i - 1]:
+                trend_score += 1
+            else:
+                trend_score -= 1
+    trend_strength = trend_score / 14.0  # -1 to 1
+    volatility = np.sqrt(ret_m2 / 59.0)
+    
+    return _score(current, baseline, mom_5min, mom_10min, mom_15min,
+                  trend_strength, volatility)
+
+
+@jit(
+    "float64[::1](float64[::1], float64[::1], float64[::1], float64[::1], "
+    "float64[::1], float64[::1], float64[::1])",
+    nopython=True,
+    cache=True,
+    fastmath=True,
+    boundscheck=False
+)
+def _score_batch(current, baselines, mom_5min, mom_10min, mom_15min,
+                 trend_strength, volatility):
+    """Run _score over precomputed per-prediction feature arrays."""
+    n = current.shape[0]
+    p_yes = np.empty(n)
+    for i in range(n):
+        p_yes[i] = _score(current[i], baselines[i], mom_5min[i], mom_10min[i],
+                          mom_15min[i], trend_strength[i], volatility[i])
+    return p_yes
+
+
+@jit(
+    "Tuple((boolean, int64, float64, float64, float64))(float64, float64, float64, float64, float64)",
+    nopython=True,
+    cache=True,
+    boundscheck=False
+)
+def _trade_decision(p_yes, market_price_yes, balance, max_position_size, min_edge):
+    """Decide whether and how to trade one interval.
+    
+    Returns:
+        Tuple of (should_trade, side, size, entry_price, edge) where side is
+        1 for YES and 0 for NO
+    """
+    # Calculate edge (accounting for fees)
+    edge_yes = p_yes - market_price_yes - 0.015  # 1.5% for fees/slippage
+    edge_no = (1.0 - p_yes) - (1.0 - market_price_yes) - 0.015
+    
+    side = 1 if edge_yes > edge_no else 0
+    best_edge = max(edge_yes, edge_no)
+    
+    # Trading decision
+    should_trade = (
+        best_edge >= min_edge and
+        abs(p_yes - 0.5) > 0.02 and  # Lower confidence requirement
+        balance >= max_position_size
+    )
+    
+    # Kelly Criterion sizing (simplified)
+    # Kelly = edge / odds
+    kelly_fraction = min(0.25, best_edge / 0.5)  # Max 25% of bankroll
+    
+    size = balance * kelly_fraction * 0.5  # Half-Kelly for safety
+    size = min(size, max_position_size, balance)
+    size = max(size, 2.0)  # Minimum $2 trade
+    
+    entry_price = market_price_yes if side == 1 else 1.0 - market_price_yes
+    
+    return should_trade, side, size, entry_price, best_edge
+
+
+@jit(
+    "Tuple((boolean, float64, float64))(int64, int64, float64, float64)",
+    nopython=True,
+    cache=True,
+    boundscheck=False
+)
+def _settle_trade(side, outcome, size, entry_price):
+    """Settle one trade against the actual outcome (1 for YES, 0 for NO).
+    
+    Returns:
+        Tuple of (won, payout, pnl); the stake was already taken from the
+        balance when the trade opened, so the balance gains the payout
+    """
+    won = side == outcome
+    payout = size / entry_price if won else 0.0
+    return won, payout, payout - size
+
+
+@jit(
+    "float64[:, ::1](float64[::1], float64[::1], int8[::1], float64[:, ::1])",
+    nopython=True,
+    parallel=True,
+    cache=True,
+    boundscheck=False
+)
+def _simulate_core(p_yes, market_price, actuals, params):
+    """Replay the trading loop once per parameter row, in parallel.
+    
+    Each row of params is (initial_balance, max_position_size, min_edge) and
+    runs its own wallet over the shared per-interval arrays. Returns one row
+    of SWEEP_METRICS per configuration.
+    """
+    n_configs = params.shape[0]
+    n = p_yes.shape[0]
+    results = np.empty((n_configs, len(SWEEP_METRICS)))
+    for cfg in prange(n_configs):
+        balance = params[cfg, 0]
+        max_position_size = params[cfg, 1]
+        min_edge = params[cfg, 2]
+        peak = balance
+        trades = 0
+        wins = 0
+        total_pnl = 0.0
+        for k in range(n):
+            should_trade, side, size, entry_price, _ = _trade_decision(
+                p_yes[k], market_price[k], balance, max_position_size, min_edge
+            )
+            if not should_trade or size > balance:
+                continue
+            won, payout, pnl = _settle_trade(side, actuals[k], size, entry_price)
+            balance -= size
+            balance += payout
+            total_pnl += pnl
+            trades += 1
+            if won:
+                wins += 1
+            if balance > peak:
+                peak = balance
+        results[cfg, 0] = balance
+        results[cfg, 1] = peak
+        results[cfg, 2] = trades
+        results[cfg, 3] = wins
+        results[cfg, 4] = total_pnl
+    return results
+
+
+def _read_price_csv(path):
+    """Parse the price column of a CSV as a contiguous float64 array."""
+    if POLARS:
+        return (
+            pl.scan_csv(path)
+            .select(pl.col('price').cast(pl.Float64))
+            .collect()
+            .to_series()
+            .to_numpy()
+        )
+    return pd.read_csv(path, usecols=['price'], dtype={'price': 'float64'})['price'].to_numpy()
+
+
+def load_prices(path, cache_dir=None):
+    """Load the price column of a CSV as a float64 array.
+    
+    With cache_dir set, the parsed prices are cached there as a .npy file
+    keyed on the CSV's name, mtime and size, which later runs memory-map
+    (read-only) instead of parsing the CSV again. Nothing is written when
+    cache_dir is None, and a cache directory that can't be written to just
+    means the CSV is parsed every time.
+    """
+    csv_path = Path(path)
+    if cache_dir is None:
+        return _read_price_csv(csv_path)
+    
+    stat = csv_path.stat()
+    cache_dir = Path(cache_dir)
+    cache_path = cache_dir / f"{csv_path.stem}-{stat.st_mtime_ns}-{stat.st_size}.npy"
+    
+    if cache_path.exists():
+        return np.load(cache_path, mmap_mode='r')
+    
+    prices = _read_price_csv(csv_path)
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        # Drop caches of older versions of this CSV
+        for stale in cache_dir.glob(f"{csv_path.stem}-*-*.npy"):
+            stale.unlink()
+        np.save(cache_path, prices)
+    except OSError:
+        pass
+    return prices
+
 
 class SimplePredictor:
     """Simple but effective predictor for 15-minute BTC direction."""
@@ -34,122 +329,200 @@ class SimplePredictor:
         if len(prices) < 60:
             return None, None
         
-        prices = np.array(prices)
-        current = prices[-1]
+        # Writable C-contiguous copy (pandas may hand out read-only views)
+        prices = np.array(prices, dtype=np.float64)
+        p_yes = _predict_core(prices, float(baseline))
         
-        # Recent momentum (last 5 and 10 minutes)
-        mom_5min = (current - prices[-5]) / prices[-5] if len(prices) >= 5 else 0
-        mom_10min = (current - prices[-10]) / prices[-10] if len(prices) >= 10 else 0
-        mom_15min = (current - prices[-15]) / prices[-15] if len(prices) >= 15 else 0
-        
-        # Trend strength (are we in a clear trend?)
-        recent_prices = prices[-15:]
-        trend_score = 0
-        for i in range(len(recent_prices) - 1):
-            if recent_prices[i+1] > recent_prices[i]:
-                trend_score += 1
-            else:
-                trend_score -= 1
-        trend_strength = trend_score / (len(recent_prices) - 1)  # -1 to 1
-        
-        # Volatility
-        returns = np.diff(prices[-60:]) / prices[-60:-1]
-        volatility = np.std(returns)
-        
-        # Distance from baseline
-        baseline_gap = (current - baseline) / baseline
-        
-        # Calculate probability
-        p_yes = 0.5
-        
-        # Strong momentum component
-        momentum_signal = (0.5 * mom_5min + 0.3 * mom_10min + 0.2 * mom_15min)
-        p_yes += momentum_signal * 50.0  # Amplify momentum
-        
-        # Trend continuation (if in strong trend, expect continuation)
-        p_yes += trend_strength * 0.15
+        # Clip to valid probability range
+        p_yes = np.clip(p_yes, 0.05, 0.95)
+        p_no = 1 - p_yes
         
-        # Position relative to baseline
-        # If we're above baseline and moving up, more likely to stay up
-        if current > baseline and momentum_signal > 0:
-            p_yes += 0.08
-        elif current < baseline and momentum_signal < 0:
-            p_yes -= 0.08
+        return p_yes, p_no
+    
+    def predict_batch(self, prices, pred_idxs, baselines):
+        """
+        Predict many points of one price series at once.
         
-        # Mean reversion for extreme moves
-        if abs(baseline_gap) > 0.02:  # 2% from baseline
-            p_yes -= baseline_gap * 5.0  # Revert to mean
+        Features for every prediction are computed with whole-array
+        operations over the series instead of slicing a window per point.
         
-        # Volatility dampens extreme predictions slightly
-        dampening = 1 - (volatility * 1000)  # Scale volatility
-        dampening = np.clip(dampening, 0.7, 1.0)
-        p_yes = 0.5 + (p_yes - 0.5) * dampening
+        Args:
+            prices: Full price series
+            pred_idxs: Index of each prediction point (needs >= 60 prior prices)
+            baselines: Baseline price for each prediction
         
-        # Clip to valid probability range
+        Returns:
+            Tuple of (p_yes, p_no) arrays
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        pred_idxs = np.asarray(pred_idxs, dtype=np.int64)
+        baselines = np.ascontiguousarray(baselines, dtype=np.float64)
+        current = prices[pred_idxs - 1]
+        
+        # Recent momentum (last 5, 10 and 15 minutes)
+        mom_5min = current / prices[pred_idxs - 5] - 1.0
+        mom_10min = current / prices[pred_idxs - 10] - 1.0
+        mom_15min = current / prices[pred_idxs - 15] - 1.0
+        
+        # Trend strength from a running count of up-moves (14 moves per window)
+        up_count = np.concatenate(([0], np.cumsum(prices[1:] > prices[:-1])))
+        ups = up_count[pred_idxs - 1] - up_count[pred_idxs - 15]
+        trend_strength = (2.0 * ups - 14.0) / 14.0
+        
+        # Volatility of the 59 one-minute returns before each prediction
+        returns = np.diff(prices) / prices[:-1]
+        volatility = sliding_window_view(returns, 59)[pred_idxs - 60].std(axis=1)
+        
+        p_yes = _score_batch(current, baselines, mom_5min, mom_10min, mom_15min,
+                             trend_strength, volatility)
         p_yes = np.clip(p_yes, 0.05, 0.95)
         p_no = 1 - p_yes
         
         return p_yes, p_no
 
 
+@dataclass(slots=True)
+class Position:
+    """A virtual position (side/outcome are 1 for YES, 0 for NO)."""
+    market_id: str
+    side: int
+    size: float
+    entry_price: float
+    p_true: float
+    edge: float
+    open_time: int
+    status: str = 'open'
+    close_time: Optional[int] = None
+    outcome: Optional[int] = None
+    won: bool = False
+    pnl: float = 0.0
+
+
 class VirtualWallet:
-    """Virtual wallet for tracking trades and P&L."""
+    """Virtual wallet for tracking trades and P&L.
+    
+    Closed trades are stored column-wise in numpy arrays that grow by
+    doubling, so statistics are computed with vectorized reductions.
+    """
+    
+    # Closed-trade columns and their dtypes (also the trade log column order)
+    TRADE_COLUMNS = (
+        ('market_id', object),
+        ('side', np.int8),
+        ('size', np.float64),
+        ('entry_price', np.float64),
+        ('p_true', np.float64),
+        ('edge', np.float64),
+        ('open_time', object),
+        ('status', object),
+        ('close_time', object),
+        ('outcome', np.int8),
+        ('won', bool),
+        ('pnl', np.float64),
+    )
     
-    def __init__(self, initial_balance=200.0):
+    def __init__(self, initial_balance=200.0, capacity=256):
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.peak_balance = initial_balance
-        self.trades = []
         self.open_positions = []
+        
+        self._cap = capacity
+        self._n = 0
+        self._cols = {name: np.empty(capacity, dtype=dtype) for name, dtype in self.TRADE_COLUMNS}
+    
+    @property
+    def num_trades(self):
+        """Number of closed trades."""
+        return self._n
+    
+    @property
+    def trades(self):
+        """Closed trades as a list of dicts (built on demand)."""
+        trades = [
+            {name: self._cols[name][i] for name, _ in self.TRADE_COLUMNS}
+            for i in range(self._n)
+        ]
+        for trade in trades:
+            trade['side'] = OUTCOME_LABELS[trade['side']]
+            trade['outcome'] = OUTCOME_LABELS[trade['outcome']]
+        return trades
+    
+    def column(self, name):
+        """View of one closed-trade column."""
+        return self._cols[name][:self._n]
     
-    def open_position(self, market_id, side, size, entry_price, p_true, edge):
-        """Open a new position."""
+    def trades_frame(self):
+        """Closed trades as a DataFrame, with side/outcome as YES/NO labels."""
+        frame = pd.DataFrame({name: self.column(name) for name, _ in self.TRADE_COLUMNS})
+        labels = np.array(OUTCOME_LABELS, dtype=object)
+        frame['side'] = labels[self.column('side')]
+        frame['outcome'] = labels[self.column('outcome')]
+        return frame
+    
+    def _grow(self):
+        """Double the capacity of the closed-trade columns."""
+        self._cap *= 2
+        for name, col in self._cols.items():
+            grown = np.empty(self._cap, dtype=col.dtype)
+            grown[:self._n] = col[:self._n]
+            self._cols[name] = grown
+    
+    def open_position(self, market_id, side, size, entry_price, p_true, edge, sim_time=None):
+        """Open a new position.
+        
+        side is 1 for YES and 0 for NO. sim_time is the simulated open time (the simulation passes the minute
+        index of the prediction); defaults to time.monotonic_ns().
+        """
         if size > self.balance:
             return None
         
-        position = {
-            'market_id': market_id,
-            'side': side,
-            'size': size,
-            'entry_price': entry_price,
-            'p_true': p_true,
-            'edge': edge,
-            'open_time': datetime.now(),
-            'status': 'open'
-        }
+        position = Position(
+            market_id=market_id,
+            side=side,
+            size=size,
+            entry_price=entry_price,
+            p_true=p_true,
+            edge=edge,
+            open_time=sim_time if sim_time is not None else time.monotonic_ns()
+        )
         
         self.open_positions.append(position)
         self.balance -= size
         
         return position
     
-    def close_position(self, position, outcome):
-        """Close a position with the actual outcome."""
-        position['close_time'] = datetime.now()
-        position['outcome'] = outcome
-        position['won'] = (position['side'] == outcome)
-        
-        if position['won']:
-            payout = position['size'] / position['entry_price']
-            profit = payout - position['size']
-            position['pnl'] = profit
-            self.balance += payout
-        else:
-            position['pnl'] = -position['size']
+    def close_position(self, position, outcome, sim_time=None):
+        """Close a position with the actual outcome (1 for YES, 0 for NO).
+        
+        sim_time is the simulated close time; defaults to time.monotonic_ns().
+        """
+        position.close_time = sim_time if sim_time is not None else time.monotonic_ns()
+        position.outcome = outcome
+        won, payout, pnl = _settle_trade(position.side, outcome, position.size, position.entry_price)
+        position.won = bool(won)
+        position.pnl = pnl
+        self.balance += payout
         
-        position['status'] = 'closed'
+        position.status = 'closed'
         
         if self.balance > self.peak_balance:
             self.peak_balance = self.balance
         
-        self.trades.append(position)
+        # Record the closed trade
+        if self._n == self._cap:
+            self._grow()
+        for name, col in self._cols.items():
+            col[self._n] = getattr(position, name)
+        self._n += 1
+        
         self.open_positions.remove(position)
         
         return position
     
     def get_stats(self):
         """Get wallet statistics."""
-        if not self.trades:
+        if not self._n:
             return {
                 'balance': self.balance,
                 'initial': self.initial_balance,
@@ -163,18 +536,18 @@ class VirtualWallet:
                 'peak_balance': self.peak_balance
             }
         
-        wins = sum(1 for t in self.trades if t['won'])
-        total_pnl = sum(t['pnl'] for t in self.trades)
+        wins = int(self.column('won').sum())
+        total_pnl = float(self.column('pnl').sum())
         roi = (self.balance - self.initial_balance) / self.initial_balance
         drawdown = (self.peak_balance - self.balance) / self.peak_balance if self.peak_balance > 0 else 0
         
         return {
             'balance': self.balance,
             'initial': self.initial_balance,
-            'total_trades': len(self.trades),
+            'total_trades': self._n,
             'wins': wins,
-            'losses': len(self.trades) - wins,
-            'win_rate': wins / len(self.trades),
+            'losses': self._n - wins,
+            'win_rate': wins / self._n,
             'total_pnl': total_pnl,
             'roi': roi,
             'drawdown': drawdown,
@@ -182,8 +555,95 @@ class VirtualWallet:
         }
 
 
-def run_simulation():
-    """Run the virtual wallet simulation."""
+def prepare_intervals(prices, predictor, interval_minutes=15, prediction_point=10,
+                      max_intervals=200, seed=None):
+    """Build the per-interval arrays shared by a simulation run and a sweep.
+    
+    Args:
+        prices: 1-minute price series
+        predictor: SimplePredictor used for every interval
+        interval_minutes: Market interval length
+        prediction_point: Minutes into each interval the prediction is made
+        max_intervals: Cap on the number of intervals simulated
+        seed: Seed for the simulated market noise (None = fresh entropy)
+    
+    Returns:
+        Tuple of (num_intervals, interval_nums, pred_idxs, ends, baselines,
+        finals, p_yes, p_no, market_prices), with every array restricted to
+        the intervals that can be simulated
+    """
+    num_intervals = min(max_intervals, (len(prices) - 120) // interval_minutes)
+    
+    # Interval boundaries; the prediction is made prediction_point minutes in
+    starts = np.arange(num_intervals) * interval_minutes
+    ends = starts + interval_minutes
+    pred_idxs = starts + prediction_point
+    
+    # Need the settlement price and 60 minutes of history before prediction
+    valid = (ends < len(prices)) & (pred_idxs >= 60)
+    interval_nums = np.nonzero(valid)[0]
+    starts, ends, pred_idxs = starts[valid], ends[valid], pred_idxs[valid]
+    
+    # Baseline (start of interval) and settlement (end of interval) prices
+    baselines = prices[starts]
+    finals = prices[ends]
+    
+    # Predict every interval from its 60-minute history in one batch
+    p_yes_all, p_no_all = predictor.predict_batch(prices, pred_idxs, baselines)
+    
+    # Simulated market noise, drawn once for all intervals (5% std dev)
+    rng = np.random.default_rng(seed)
+    noises = rng.normal(0.0, 0.05, size=num_intervals)
+    
+    # Simulate market odds (with some noise around fair value)
+    # In reality, market might misprice - that's where edge comes from
+    # Markets tend to lag true probabilities slightly
+    market_lag = -0.15 * (p_yes_all - 0.5)  # Market lags behind true prob
+    market_prices = np.clip(0.50 + noises[interval_nums] + market_lag, 0.15, 0.85)
+    
+    return (num_intervals, interval_nums, pred_idxs, ends, baselines, finals,
+            p_yes_all, p_no_all, market_prices)
+
+
+def sweep_parameters(prices, params, seed=None, num_threads=None):
+    """Run the trading loop for many parameter settings in parallel.
+    
+    Predictions and market prices are computed once; each configuration then
+    replays its own wallet over them on a separate thread.
+    
+    Args:
+        prices: 1-minute price series
+        params: (n_configs, 3) array with columns SWEEP_PARAMS
+        seed: Seed for the simulated market noise (None = fresh entropy)
+        num_threads: Number of Numba threads (None = Numba default)
+    
+    Returns:
+        DataFrame with the SWEEP_PARAMS and SWEEP_METRICS of each configuration
+    """
+    params = np.ascontiguousarray(params, dtype=np.float64)
+    (_, _, _, _, baselines, finals,
+     p_yes, _, market_prices) = prepare_intervals(prices, SimplePredictor(), seed=seed)
+    actuals = (finals > baselines).astype(np.int8)
+    
+    if num_threads is not None:
+        set_num_threads(num_threads)
+    results = _simulate_core(p_yes, market_prices, actuals, params)
+    
+    frame = pd.DataFrame(params, columns=list(SWEEP_PARAMS))
+    for j, name in enumerate(SWEEP_METRICS):
+        frame[name] = results[:, j]
+    return frame
+
+
+def run_simulation(seed=None):
+    """Run the virtual wallet simulation.
+    
+    Args:
+        seed: Seed for the simulated market noise (None = fresh entropy)
+    
+    Returns:
+        Final wallet statistics, or None if the price data could not be loaded
+    """
     
     print("=" * 80)
     print("🎮 VIRTUAL WALLET SIMULATION")
@@ -196,10 +656,10 @@ def run_simulation():
     # Load data
     print("📊 Loading Bitcoin price data...")
     try:
-        df = pd.read_csv('data/btc_1min.csv')
-        print(f"   ✓ Loaded {len(df):,} 1-minute data points")
-        print(f"   ✓ Date range: {len(df)} minutes (~{len(df)//60/24:.1f} days)")
-        print(f"   ✓ Price range: ${df['price'].min():,.2f} - ${df['price'].max():,.2f}")
+        prices = load_prices('data/btc_1min.csv', cache_dir='data/.cache')
+        print(f"   ✓ Loaded {len(prices):,} 1-minute data points")
+        print(f"   ✓ Date range: {len(prices)} minutes (~{len(prices)//60/24:.1f} days)")
+        print(f"   ✓ Price range: ${prices.min():,.2f} - ${prices.max():,.2f}")
     except Exception as e:
         print(f"   ✗ Error loading data: {e}")
         print("   Run: python generate_test_data.py")
@@ -220,121 +680,74 @@ def run_simulation():
     min_edge_threshold = 0.01  # 1% minimum edge (more realistic)
     max_position_size = 15.0   # $15 max per trade
     
-    predictions = []
-    
     print("🚀 Starting simulation...")
     print("=" * 80)
     print()
     
     # Simulate intervals
-    num_intervals = min(200, (len(df) - 120) // interval_minutes)
+    (num_intervals, interval_nums, pred_idxs, ends, baselines, finals,
+     p_yes_all, p_no_all, market_prices) = prepare_intervals(
+        prices, predictor, interval_minutes, prediction_point, seed=seed
+    )
     
-    for interval_num in range(num_intervals):
-        # Define interval
-        start_idx = interval_num * interval_minutes
-        end_idx = start_idx + interval_minutes
-        
-        if end_idx >= len(df):
-            break
-        
-        # Get warmup data (90 minutes before)
-        warmup_start = max(0, start_idx - 90)
-        
-        # Baseline price (start of interval)
-        baseline = df.iloc[start_idx]['price']
-        
-        # Settlement price (end of interval)
-        final_price = df.iloc[end_idx]['price']
-        actual_outcome = "YES" if final_price > baseline else "NO"
-        
-        # Make prediction at 10 minutes into interval
-        pred_idx = start_idx + prediction_point
-        
-        if pred_idx >= len(df):
-            continue
-        
-        # Get price history up to prediction point
-        hist_prices = df.iloc[warmup_start:pred_idx]['price'].values
-        
-        if len(hist_prices) < 60:
-            continue
-        
-        # Make prediction
-        p_yes, p_no = predictor.predict(hist_prices, baseline)
-        
-        if p_yes is None:
-            continue
-        
-        # Determine prediction
-        predicted_outcome = "YES" if p_yes > 0.5 else "NO"
-        confidence = abs(p_yes - 0.5)
-        
-        # Simulate market odds (with some noise around fair value)
-        # In reality, market might misprice - that's where edge comes from
-        # Markets tend to lag true probabilities slightly
-        market_noise = np.random.normal(0, 0.05)  # 5% std dev
-        market_lag = -0.15 * (p_yes - 0.5)  # Market lags behind true prob
-        market_price_yes = np.clip(0.50 + market_noise + market_lag, 0.15, 0.85)
-        
-        # Calculate edge (accounting for fees)
-        edge_yes = p_yes - market_price_yes - 0.015  # 1.5% for fees/slippage
-        edge_no = p_no - (1 - market_price_yes) - 0.015
+    # Prediction records; the *_arr names below are views into its columns
+    num_predictions = len(interval_nums)
+    preds = np.zeros(num_predictions, dtype=PREDICTION_DTYPE)
+    preds['interval'] = interval_nums
+    preds['baseline'] = baselines
+    preds['final_price'] = finals
+    preds['p_yes'] = p_yes_all
+    preds['p_no'] = p_no_all
+    
+    # Actual and predicted outcome codes for all intervals (1=YES, 0=NO)
+    actuals = (finals > baselines).astype(np.int8)
+    predicted = (p_yes_all > 0.5).astype(np.int8)
+    labels = np.array(OUTCOME_LABELS)
+    preds['actual_outcome'] = labels[actuals]
+    preds['predicted_outcome'] = labels[predicted]
+    conf_arr = preds['confidence']
+    conf_arr[:] = np.abs(p_yes_all - 0.5)
+    correct_arr = preds['correct']
+    correct_arr[:] = predicted == actuals
+    
+    market_price_arr = preds['market_price']
+    market_price_arr[:] = market_prices
+    
+    # Trading results, filled in per interval
+    edge_arr = preds['edge']
+    traded_arr = preds['traded']
+    pnl_arr = preds['pnl']
+    
+    actual_codes = actuals.tolist()
+    for k, interval_num in enumerate(interval_nums.tolist()):
+        actual_outcome = actual_codes[k]
         
-        best_edge = max(edge_yes, edge_no)
-        best_side = "YES" if edge_yes > edge_no else "NO"
+        p_yes = p_yes_all[k]
+        p_no = p_no_all[k]
         
-        # Trading decision
-        should_trade = (
-            best_edge >= min_edge_threshold and 
-            confidence > 0.02 and  # Lower confidence requirement
-            wallet.balance >= max_position_size
+        should_trade, side, size, entry_price, best_edge = _trade_decision(
+            p_yes, market_price_arr[k], wallet.balance, max_position_size, min_edge_threshold
         )
-        
-        trade_executed = None
-        
         if should_trade:
-            # Kelly Criterion sizing (simplified)
-            # Kelly = edge / odds
-            edge_pct = best_edge / 0.5
-            kelly_fraction = min(0.25, edge_pct)  # Max 25% of bankroll
-            
-            size = wallet.balance * kelly_fraction * 0.5  # Half-Kelly for safety
-            size = min(size, max_position_size, wallet.balance)
-            size = max(size, 2.0)  # Minimum $2 trade
-            
             # Execute trade
-            entry_price = market_price_yes if best_side == "YES" else (1 - market_price_yes)
-            
             position = wallet.open_position(
                 market_id=f"BTC-15M-{interval_num}",
-                side=best_side,
+                side=side,
                 size=size,
                 entry_price=entry_price,
-                p_true=p_yes if best_side == "YES" else p_no,
-                edge=best_edge
+                p_true=p_yes if side else p_no,
+                edge=best_edge,
+                sim_time=int(pred_idxs[k])
             )
             
             if position:
                 # Settle position
-                wallet.close_position(position, actual_outcome)
-                trade_executed = position
+                wallet.close_position(position, actual_outcome, sim_time=int(ends[k]))
+                traded_arr[k] = True
+                pnl_arr[k] = position.pnl
         
         # Record prediction
-        predictions.append({
-            'interval': interval_num,
-            'baseline': baseline,
-            'final_price': final_price,
-            'actual_outcome': actual_outcome,
-            'p_yes': p_yes,
-            'p_no': p_no,
-            'predicted_outcome': predicted_outcome,
-            'confidence': confidence,
-            'correct': predicted_outcome == actual_outcome,
-            'market_price': market_price_yes,
-            'edge': best_edge,
-            'traded': trade_executed is not None,
-            'pnl': trade_executed['pnl'] if trade_executed else 0
-        })
+        edge_arr[k] = best_edge
         
         # Print progress
         if (interval_num + 1) % 20 == 0:
@@ -371,47 +784,42 @@ def run_simulation():
     print(f"Losses:               {stats['losses']}")
     print(f"Win Rate:             {stats['win_rate']:.2%}")
     
-    if wallet.trades:
-        wins = [t for t in wallet.trades if t['won']]
-        losses = [t for t in wallet.trades if not t['won']]
-        
-        if wins:
-            avg_win = np.mean([t['pnl'] for t in wins])
+    if wallet.num_trades:
+        pnl = wallet.column('pnl')
+        won = wallet.column('won')
+        n_wins = stats['wins']
+        n_losses = stats['losses']
+        
+        if n_wins:
+            avg_win = pnl[won].mean()
             print(f"Average Win:          ${avg_win:+.2f}")
         
-        if losses:
-            avg_loss = np.mean([t['pnl'] for t in losses])
+        if n_losses:
+            avg_loss = pnl[~won].mean()
             print(f"Average Loss:         ${avg_loss:+.2f}")
         
-        avg_trade = np.mean([t['pnl'] for t in wallet.trades])
+        avg_trade = pnl.mean()
         print(f"Average Trade:        ${avg_trade:+.2f}")
         
         # Expectancy
-        if wins and losses:
-            win_prob = len(wins) / len(wallet.trades)
+        if n_wins and n_losses:
+            win_prob = n_wins / wallet.num_trades
             loss_prob = 1 - win_prob
             expectancy = (avg_win * win_prob) + (avg_loss * loss_prob)
             print(f"Trade Expectancy:     ${expectancy:+.2f}")
     print()
     
     # Prediction metrics
-    if predictions:
-        pred_df = pd.DataFrame(predictions)
-        
+    if num_predictions:
         print("🎯 PREDICTION ACCURACY")
         print("-" * 80)
-        print(f"Total Predictions:    {len(pred_df)}")
-        print(f"Overall Accuracy:     {pred_df['correct'].mean():.2%}")
-        print(f"Avg Confidence:       {pred_df['confidence'].mean():.4f}")
+        print(f"Total Predictions:    {num_predictions}")
+        print(f"Overall Accuracy:     {correct_arr.mean():.2%}")
+        print(f"Avg Confidence:       {conf_arr.mean():.4f}")
         
         # Brier score
-        brier_scores = []
-        for _, row in pred_df.iterrows():
-            actual = 1.0 if row['actual_outcome'] == "YES" else 0.0
-            brier_scores.append((row['p_yes'] - actual) ** 2)
-        
-        brier_score = np.mean(brier_scores)
-        brier_rating = 'EXCELLENT' if brier_score < 0.15 else 'GOOD' if brier_score < 0.20 else 'FAIR' if brier_score < 0.25 else 'POOR'
+        brier_score = np.mean((p_yes_all - actuals) ** 2)
+        brier_rating = _BRIER_LABEL[int(np.searchsorted(_BRIER_CUT, brier_score, side='right'))]
         print(f"Brier Score:          {brier_score:.4f} ({brier_rating})")
         print()
         
@@ -419,35 +827,38 @@ def run_simulation():
         print("📊 ACCURACY BY CONFIDENCE")
         print("-" * 80)
         
-        high = pred_df[pred_df['confidence'] > 0.15]
-        med = pred_df[(pred_df['confidence'] > 0.05) & (pred_df['confidence'] <= 0.15)]
-        low = pred_df[pred_df['confidence'] <= 0.05]
+        high = conf_arr > 0.15
+        low = conf_arr <= 0.05
+        med = ~high & ~low
         
-        if len(high) > 0:
-            print(f"High (>15%):          {len(high):3d} predictions, {high['correct'].mean():.1%} accurate")
-        if len(med) > 0:
-            print(f"Medium (5-15%):       {len(med):3d} predictions, {med['correct'].mean():.1%} accurate")
-        if len(low) > 0:
-            print(f"Low (<5%):            {len(low):3d} predictions, {low['correct'].mean():.1%} accurate")
+        for label, mask in (("High (>15%):        ", high),
+                            ("Medium (5-15%):     ", med),
+                            ("Low (<5%):          ", low)):
+            count = int(mask.sum())
+            if count > 0:
+                print(f"{label}  {count:3d} predictions, {correct_arr[mask].mean():.1%} accurate")
         print()
         
         # Trade analysis
-        traded = pred_df[pred_df['traded']]
-        if len(traded) > 0:
+        num_traded = int(traded_arr.sum())
+        if num_traded > 0:
             print("💼 TRADE EXECUTION")
             print("-" * 80)
-            print(f"Opportunities:        {len(pred_df)}")
-            print(f"Trades Executed:      {len(traded)} ({len(traded)/len(pred_df):.1%})")
-            print(f"Avg Edge (traded):    {traded['edge'].mean():.2%}")
-            print(f"Trade Accuracy:       {traded['correct'].mean():.2%}")
+            print(f"Opportunities:        {num_predictions}")
+            print(f"Trades Executed:      {num_traded} ({num_traded/num_predictions:.1%})")
+            print(f"Avg Edge (traded):    {edge_arr[traded_arr].mean():.2%}")
+            print(f"Trade Accuracy:       {correct_arr[traded_arr].mean():.2%}")
             print()
         
         # Save results
-        pred_df.to_csv('logs/simulation_predictions.csv', index=False)
+        if POLARS:
+            pl.from_numpy(preds).write_csv('logs/simulation_predictions.csv')
+        else:
+            pd.DataFrame(preds).to_csv('logs/simulation_predictions.csv', index=False)
         print(f"✓ Predictions saved: logs/simulation_predictions.csv")
         
-    if wallet.trades:
-        trades_df = pd.DataFrame(wallet.trades)
+    if wallet.num_trades:
+        trades_df = wallet.trades_frame()
         trades_df.to_csv('logs/simulation_trades.csv', index=False)
         print(f"✓ Trades saved: logs/simulation_trades.csv")
     
@@ -477,8 +888,8 @@ def run_simulation():
         print(f"❌ UNPROFITABLE: {stats['roi']:+.1%}")
         print(f"    System needs significant improvement")
     
-    if predictions:
-        accuracy = pred_df['correct'].mean()
+    if num_predictions:
+        accuracy = correct_arr.mean()
         if accuracy > 0.60:
             print(f"🎯 STRONG PREDICTIONS: {accuracy:.1%} accuracy")
         elif accuracy > 0.52:
@@ -487,6 +898,8 @@ def run_simulation():
             print(f"📊 Prediction accuracy: {accuracy:.1%}")
     
     print()
+    
+    return stats
 
 
 if __name__ == "__main__":
@@ -171,6 +171,28 @@ class TestCircuitBreaker:
         assert slippage == learner.default_slippage_bps_buffer
         assert scale == learner.default_max_qty_scale
     
+    def test_circuit_breaker_warning_rate_limited(self, caplog):
+        """Test get_action warns about the breaker once per interval."""
+        config = LearnerConfig(max_consecutive_losses=1)
+        learner = OnlineLearner(config)
+        
+        learner.record_outcome(TradeOutcome(
+            timestamp=datetime.utcnow(),
+            spread_bps=50, depth=500, volatility=0.02,
+            time_to_expiry_minutes=10, recent_fill_rate=0.8,
+            recent_slippage_bps=30, mapping_confidence=0.7,
+            slippage_buffer_bps=50, qty_scale=0.5,
+            filled=True, slippage_realized_bps=30,
+            pnl=-10.0
+        ))
+        
+        with caplog.at_level("WARNING"):
+            for _ in range(5):
+                learner.get_action(50, 500, 0.02, 10, 0.8, 30)
+        
+        warnings = [r for r in caplog.records if "using conservative defaults" in r.getMessage()]
+        assert len(warnings) == 1
+    
     def test_reset_circuit_breaker(self):
         """Test manual circuit breaker reset."""
         config = LearnerConfig(max_consecutive_losses=1)
@@ -231,4 +253,34 @@ class TestLearnerStats:
         assert stats["total_outcomes"] == 4
         assert stats["total_pnl"] == 20.0  # 10 - 5 + 0 + 15
         assert stats["peak_pnl"] == 20.0  # Peak is max(running total)
-
+    
+    def test_batch_matches_sequential(self):
+        """Test batch recording matches recording one outcome at a time."""
+        config = LearnerConfig(max_consecutive_losses=3, max_drawdown_pct=0.5)
+        pnls = [5.0, -2.0, -1.0, 4.0, -3.0, -3.0, -3.0, 2.0]
+        outcomes = [
+            TradeOutcome(
+                timestamp=datetime.utcnow(),
+                spread_bps=50, depth=500, volatility=0.02,
+                time_to_expiry_minutes=10, recent_fill_rate=0.8,
+                recent_slippage_bps=30, mapping_confidence=0.7,
+                slippage_buffer_bps=50, qty_scale=0.5,
+                filled=True, slippage_realized_bps=20,
+                pnl=pnl
+            )
+            for pnl in pnls
+        ]
+        
+        sequential = OnlineLearner(config)
+        for outcome in outcomes:
+            sequential.record_outcome(outcome)
+        
+        batch = OnlineLearner(config)
+        batch.record_outcomes_batch(outcomes[:3])
+        batch.record_outcomes_batch(outcomes[3:])
+        
+        assert batch.total_pnl == pytest.approx(sequential.total_pnl)
+        assert batch.peak_pnl == pytest.approx(sequential.peak_pnl)
+        assert batch.consecutive_losses == sequential.consecutive_losses
+        assert batch.circuit_breaker_active == sequential.circuit_breaker_active
+        assert batch.weights == pytest.approx(sequential.weights)
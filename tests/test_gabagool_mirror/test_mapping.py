@@ -63,6 +63,15 @@ class TestKalshiFeatureExtraction:
         assert features.window_minutes == 15
         assert features.strike == 95000
     
+    def test_ticker_expiry_parsing(self):
+        """Test ticker expiry (ET) is converted to UTC ms."""
+        mapper = MarketMapping()
+        market = {"ticker": "KXBTC15M-26JAN071845-45"}
+        
+        features = mapper.extract_kalshi_features(market)
+        
+        assert features.expiry_ts == int(datetime(2026, 1, 7, 23, 45).timestamp() * 1000)
+    
     def test_eth_ticker_parsing(self):
         """Test parsing ETH ticker."""
         mapper = MarketMapping()
@@ -74,6 +83,15 @@ class TestKalshiFeatureExtraction:
         features = mapper.extract_kalshi_features(market)
         
         assert features.underlying == Underlying.ETH
+    
+    def test_ticker_features_cached(self):
+        """Test repeated tickers reuse the parsed features."""
+        mapper = MarketMapping()
+        market = {"ticker": "KXBTC15M-26JAN071845-45", "floor_strike": 95000}
+        
+        features = mapper.extract_kalshi_features(market)
+        
+        assert mapper.extract_kalshi_features(dict(market)) is features
 
 
 class TestMappingScoring:
@@ -116,6 +134,26 @@ class TestMappingScoring:
         assert breakdown["underlying"] == 0.0
         assert score < 0.5  # Should be low overall
     
+    def test_different_underlying_short_circuits(self):
+        """Test mismatched underlyings score zero regardless of other features."""
+        mapper = MarketMapping()
+        
+        poly_features = MarketFeatures(
+            underlying=Underlying.BTC,
+            contract_type=ContractType.UP_DOWN_15M,
+            expiry_ts=1704672000000
+        )
+        kalshi_features = MarketFeatures(
+            underlying=Underlying.ETH,
+            contract_type=ContractType.UP_DOWN_15M,
+            expiry_ts=1704672000000
+        )
+        
+        score, breakdown = mapper.score_mapping(poly_features, kalshi_features)
+        
+        assert score == 0.0
+        assert breakdown["time_proximity"] == 0.0
+    
     def test_time_proximity_decay(self):
         """Test time proximity score decay."""
         mapper = MarketMapping()
@@ -146,7 +184,53 @@ class TestMappingScoring:
         score, breakdown = mapper.score_mapping(poly_features, kalshi_features)
         
         assert breakdown["time_proximity"] == 0.0
-
+    
+    def test_score_cached_per_feature_pair(self):
+        """Test equal feature pairs reuse the cached score."""
+        mapper = MarketMapping()
+        
+        score1, breakdown1 = mapper.score_mapping(
+            MarketFeatures(underlying=Underlying.BTC, expiry_ts=1704672000000),
+            MarketFeatures(underlying=Underlying.BTC, expiry_ts=1704672000000)
+        )
+        score2, breakdown2 = mapper.score_mapping(
+            MarketFeatures(underlying=Underlying.BTC, expiry_ts=1704672000000),
+            MarketFeatures(underlying=Underlying.BTC, expiry_ts=1704672000000)
+        )
+        
+        assert len(mapper._score_cache) == 1
+        assert (score1, breakdown1) == (score2, breakdown2)
+        
+        mapper.build_kalshi_index([])
+        assert len(mapper._score_cache) == 0
+    
+    def test_plain_string_features_match_enums(self):
+        """Test features built from plain string values still match."""
+        mapper = MarketMapping()
+        
+        poly_features = MarketFeatures(underlying="BTC", contract_type="UP_DOWN_15M")
+        kalshi_features = MarketFeatures(
+            underlying=Underlying.BTC,
+            contract_type=ContractType.UP_DOWN_15M
+        )
+        
+        score, breakdown = mapper.score_mapping(poly_features, kalshi_features)
+        
+        assert breakdown["underlying"] == 1.0
+        assert breakdown["contract_type"] == 1.0
+    
+    def test_returned_breakdown_is_a_copy(self):
+        """Test mutating a returned breakdown doesn't leak into later calls."""
+        mapper = MarketMapping()
+        btc = MarketFeatures(underlying=Underlying.BTC, expiry_ts=1704672000000)
+        eth = MarketFeatures(underlying=Underlying.ETH, expiry_ts=1704672000000)
+        
+        for poly, kalshi in ((btc, btc), (btc, eth)):
+            _, breakdown = mapper.score_mapping(poly, kalshi)
+            expected = dict(breakdown)
+            breakdown["underlying"] = -1.0
+            
+            assert mapper.score_mapping(poly, kalshi)[1] == expected
 
 class TestFindBestMatch:
     """Test finding best Kalshi match."""
@@ -184,4 +268,23 @@ class TestFindBestMatch:
         
         # Should have low confidence due to no underlying match
         assert result.confidence < 0.5
-
+    
+    def test_indexed_match_agrees_with_scan(self):
+        """Test matching through a Kalshi index picks the same market."""
+        mapper = MarketMapping()
+        
+        poly_title = "Bitcoin Up or Down - January 7, 6:45PM-7:00PM ET"
+        poly_id = "poly_market_123"
+        
+        kalshi_markets = [
+            {"ticker": "KXBTC15M-26JAN071845-45", "title": "BTC 15m", "floor_strike": 95000},
+            {"ticker": "KXETH15M-26JAN071845-00", "title": "ETH 15m"},
+            {"ticker": "KXBTC15M-26JAN072000-45", "title": "BTC 15m"},
+        ]
+        
+        index = mapper.build_kalshi_index(kalshi_markets)
+        scanned = mapper.find_best_kalshi_match(poly_title, poly_id, kalshi_markets)
+        indexed = mapper.find_best_kalshi_match(poly_title, poly_id, [], kalshi_index=index)
+        
+        assert indexed.kalshi_ticker == scanned.kalshi_ticker
+        assert indexed.confidence == scanned.confidence
@@ -39,6 +39,11 @@ class TestSignalIdGeneration:
         id2 = CopySignal.generate_signal_id("trade_123", 0, "0xdef")
         
         assert id1 != id2
+    
+    def test_signal_id_stable_across_versions(self):
+        """Signal IDs are persisted, so the hash must not change."""
+        assert CopySignal.generate_signal_id("trade_123", 0, "0xabc") == "15d85b448242d6e30922b376bb5e078a"
+        assert CopySignal.generate_signal_id("trade_123", 1) == "d423c13f2df39910d1fe5de3193c7e33"
 
 
 class TestSignalFromPolymarketTrade:
@@ -128,6 +133,20 @@ class TestSignalSerialization:
         assert restored.qty == original.qty
         assert restored.price == original.price
     
+    def test_to_dict_copies_nested_meta(self):
+        """Test mutating the serialized meta leaves the signal untouched."""
+        signal = CopySignal(
+            signal_id="test_123",
+            ts_ms=0,
+            meta={"fills": [{"price": 0.55}]}
+        )
+        
+        data = signal.to_dict()
+        data["meta"]["fills"][0]["price"] = 0.99
+        data["meta"]["fills"].append({"price": 0.60})
+        
+        assert signal.meta == {"fills": [{"price": 0.55}]}
+    
     def test_hash_and_equality(self):
         """Test signal hashing and equality."""
         signal1 = CopySignal(signal_id="test_123", ts_ms=0)
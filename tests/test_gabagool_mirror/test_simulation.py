@@ -103,6 +103,95 @@ class TestFillModel:
         assert result.status == FillStatus.MISSED
         assert result.filled_qty == 0
     
+    def test_sell_stops_at_limit(self, simple_orderbook):
+        """Test selling into descending bids stops at the limit."""
+        model = FillModel(fee_bps=70, slippage_buffer_bps=0)
+        
+        result = model.simulate_fill(
+            orderbook=simple_orderbook,
+            side="YES",
+            action="SELL",
+            qty=250,
+            limit_price=0.45  # Excludes the 0.44 level
+        )
+        
+        assert result.status == FillStatus.PARTIAL
+        assert result.filled_qty == 100
+        assert result.avg_fill_price == 0.45
+    
+    def test_unsorted_book(self):
+        """Test levels given worst first (as Polymarket does) fill best first."""
+        orderbook = Orderbook(
+            market_id="test_market",
+            venue="POLYMARKET",
+            timestamp=datetime.utcnow(),
+            yes_bids=[
+                OrderbookLevel(price=0.44, qty=200),
+                OrderbookLevel(price=0.45, qty=100),
+            ],
+            yes_asks=[
+                OrderbookLevel(price=0.55, qty=300),
+                OrderbookLevel(price=0.52, qty=200),
+                OrderbookLevel(price=0.50, qty=100),
+            ],
+            no_bids=[],
+            no_asks=[]
+        )
+        model = FillModel(fee_bps=70, slippage_buffer_bps=0)
+        
+        buy = model.simulate_fill(
+            orderbook=orderbook,
+            side="YES",
+            action="BUY",
+            qty=250,
+            limit_price=0.53
+        )
+        sell = model.simulate_fill(
+            orderbook=orderbook,
+            side="YES",
+            action="SELL",
+            qty=250,
+            limit_price=0.45
+        )
+        
+        assert buy.status == FillStatus.FILLED
+        assert abs(buy.avg_fill_price - 0.512) < 0.001
+        assert sell.status == FillStatus.PARTIAL
+        assert sell.filled_qty == 100
+        assert sell.avg_fill_price == 0.45
+    
+    def test_replaced_levels_refresh_arrays(self, simple_orderbook):
+        """Test replacing a side's levels isn't served from stale arrays."""
+        model = FillModel(fee_bps=70, slippage_buffer_bps=0)
+        
+        first = model.simulate_fill(
+            orderbook=simple_orderbook,
+            side="YES",
+            action="BUY",
+            qty=50,
+            limit_price=0.55
+        )
+        simple_orderbook.yes_asks = [OrderbookLevel(price=0.40, qty=100)]
+        second = model.simulate_fill(
+            orderbook=simple_orderbook,
+            side="YES",
+            action="BUY",
+            qty=50,
+            limit_price=0.55
+        )
+        simple_orderbook.yes_asks.append(OrderbookLevel(price=0.30, qty=100))
+        third = model.simulate_fill(
+            orderbook=simple_orderbook,
+            side="YES",
+            action="BUY",
+            qty=50,
+            limit_price=0.55
+        )
+        
+        assert first.avg_fill_price == 0.50
+        assert second.avg_fill_price == 0.40
+        assert third.avg_fill_price == 0.30
+    
     def test_slippage_buffer_extends_limit(self, simple_orderbook):
         """Test slippage buffer extends effective limit."""
         model = FillModel(fee_bps=70, slippage_buffer_bps=300)  # 3% buffer
@@ -242,6 +331,26 @@ class TestPositionLedger:
         assert pos1 is pos2  # Same instance
         assert pos1 is not pos3  # Different instance
     
+    def test_reset_clears_ledger(self):
+        """Test reset starts a fresh ledger without touching old positions."""
+        ledger = PositionLedger(venue="KALSHI")
+        
+        old = ledger.add_fill("market_1", "YES", 100, 50)
+        ledger.settle_market("market_1", "YES")
+        ledger.reset()
+        
+        pos = ledger.get_or_create("market_2")
+        
+        assert pos is not old
+        assert old.market_id == "market_1"
+        assert old.yes_qty == 100 and old.settled_at is not None
+        assert pos.yes_qty == 0 and pos.settled_at is None
+        assert ledger.total_realized_pnl == 0.0
+        assert ledger.get_summary()["total_positions"] == 1
+        
+        ledger.add_fill("market_2", "NO", 10, 4)
+        assert len(ledger.open_positions) == 1
+    
     def test_add_fill_updates_position(self):
         """Test adding fills through ledger."""
         ledger = PositionLedger(venue="KALSHI")
@@ -280,4 +389,41 @@ class TestPositionLedger:
         assert summary["total_yes_qty"] == 150
         assert summary["total_no_qty"] == 100
         assert summary["total_locked_edge"] == 5.0  # Only market_1 is hedged
-
+    
+    def test_summary_tracks_reductions(self):
+        """Test vectorized aggregates match the positions across many markets."""
+        ledger = PositionLedger(venue="KALSHI")
+        n = 129
+        
+        for i in range(n):
+            ledger.add_fill(f"market_{i}", "YES", 10, 5)
+        ledger.get_or_create("market_0").reduce_position("YES", 4)
+        ledger.settle_market("market_1", "YES")
+        
+        open_pos = ledger.open_positions
+        summary = ledger.get_summary()
+        
+        assert summary["total_positions"] == n
+        assert summary["open_positions"] == len(open_pos) == n - 1
+        assert summary["total_yes_qty"] == sum(p.yes_qty for p in open_pos.values())
+        assert summary["total_unrealized_cost"] == pytest.approx(
+            sum(p.total_cost for p in open_pos.values())
+        )
+    
+    def test_summary_reflects_direct_writes(self):
+        """Test aggregates read positions mutated without their methods."""
+        ledger = PositionLedger(venue="KALSHI")
+        
+        pos = ledger.add_fill("market_1", "YES", 100, 40)
+        ledger.add_fill("market_2", "NO", 50, 20)
+        
+        pos.no_qty = 100
+        pos.no_total_cost = 50
+        ledger.get_or_create("market_2").no_qty = 0
+        
+        summary = ledger.get_summary()
+        
+        assert summary["open_positions"] == 1
+        assert list(ledger.open_positions) == ["market_1"]
+        assert summary["total_no_qty"] == 100
+        assert summary["total_locked_edge"] == pytest.approx(pos.hedge_locked_edge)
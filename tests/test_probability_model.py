@@ -0,0 +1,58 @@
+"""Tests for probability model."""
+
+import numpy as np
+import pytest
+from src.models.probability_model import compute_return_volatility, simulate_price_paths
+
+
+class TestReturnVolatility:
+    """Test return volatility kernel."""
+    
+    def test_duplicate_timestamps_skipped(self):
+        """Test ticks sharing a timestamp don't raise or poison the estimate."""
+        prices = np.array([100.0, 101.0, 102.0, 101.0, 100.0])
+        timestamps = np.array([0.0, 1.0, 1.0, 2.0, 3.0])
+        
+        volatility = compute_return_volatility(prices, timestamps)
+        
+        # Only the pairs with a positive time step contribute
+        log_returns = np.log([101.0 / 100.0, 101.0 / 102.0, 100.0 / 101.0])
+        assert volatility == pytest.approx(np.std(log_returns))
+    
+    def test_no_time_step_is_nan(self):
+        """Test a series without any positive time step gives NaN."""
+        prices = np.array([100.0, 101.0])
+        timestamps = np.array([5.0, 5.0])
+        
+        assert np.isnan(compute_return_volatility(prices, timestamps))
+
+
+class TestSimulatePricePaths:
+    """Test GBM path simulation."""
+    
+    def test_seeded_paths_reproducible(self):
+        """Test the same seed gives the same paths."""
+        paths1 = simulate_price_paths(50000.0, 61, 100, 0.001, 42)
+        paths2 = simulate_price_paths(50000.0, 61, 100, 0.001, 42)
+        
+        assert paths1.shape == (100, 61)
+        assert np.array_equal(paths1, paths2)
+        assert (paths1[:, 0] == 50000.0).all()
+    
+    def test_no_seed(self):
+        """Test paths can be simulated without a seed."""
+        paths = simulate_price_paths(
+            current_price=50000,
+            num_steps=61,
+            num_sims=100,
+            volatility_per_second=0.001,
+            random_seed=None
+        )
+        
+        assert paths.shape == (100, 61)
+        assert np.isfinite(paths).all()
+        assert (paths > 0).all()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
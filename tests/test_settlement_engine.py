@@ -93,6 +93,126 @@ class TestSettlementEngine:
         # With very low volatility and 5 seconds remaining,
         # outcome should be locked to YES
         assert locked == "YES"
+    
+    def test_outcome_locked_batch(self, mock_brti_feed):
+        """Test batch lock detection matches the scalar check."""
+        engine = SettlementEngine(
+            brti_feed=mock_brti_feed,
+            convention="A"
+        )
+        
+        engine.update()
+        
+        avg60 = engine.get_current_avg60()
+        baselines = [40000, avg60, 60000]
+        locked = engine.is_outcome_locked_batch(
+            baselines=baselines,
+            seconds_remaining=5,
+            volatility_per_second=0.0001
+        )
+        
+        codes = {"YES": 1, "NO": 0, None: -1}
+        expected = [
+            codes[engine.is_outcome_locked(b, 5, 0.0001)]
+            for b in baselines
+        ]
+        assert locked.tolist() == expected == [1, -1, 0]
+    
+    def test_outcome_not_locked_for_degenerate_inputs(self, mock_brti_feed):
+        """Test NaN volatility or negative time never reports a lock."""
+        engine = SettlementEngine(
+            brti_feed=mock_brti_feed,
+            convention="A"
+        )
+        
+        engine.update()
+        
+        nan = float("nan")
+        assert engine.is_outcome_locked(40000, 5, nan) is None
+        assert engine.is_outcome_locked(40000, -5, 0.0001) is None
+        
+        locked = engine.is_outcome_locked_batch(
+            baselines=[40000, 40000, 40000],
+            seconds_remaining=[5, -5, 5],
+            volatility_per_second=[nan, 0.0001, 0.0001]
+        )
+        assert locked.tolist() == [-1, -1, 1]
+    
+    def test_rolling_avg60_matches_per_convention(self, mock_brti_feed):
+        """Test the single-scan rolling averages match each convention."""
+        engine = SettlementEngine(
+            brti_feed=mock_brti_feed,
+            convention="A"
+        )
+        
+        now = time.time()
+        avg60_a, avg60_b = engine.compute_rolling_avg60(now)
+        
+        assert avg60_a == engine.compute_avg60_for_timestamp(now, convention="A")
+        assert avg60_b == engine.compute_avg60_for_timestamp(now, convention="B")
+    
+    def test_window_edges_and_unsorted_ticks(self):
+        """Test window edges are inclusive and tick order doesn't matter."""
+        feed = BRTIFeed(
+            use_cf_benchmarks=False,
+            fallback_exchanges=["coinbase"],
+            update_interval=1.0,
+            buffer_size=300
+        )
+        
+        # Integer timestamps so ticks land exactly on the window edges;
+        # appended out of order
+        for i in reversed(range(120)):
+            feed.price_buffer.append(PriceTick(
+                timestamp=1000.0 + i,
+                price=50000 + i * 10,
+                source="test"
+            ))
+        
+        engine = SettlementEngine(brti_feed=feed, convention="A")
+        settle_time = 1100.0
+        
+        # A: ticks 1040..1099, B: ticks 1040..1100
+        expected_a = 50000 + 10 * 69.5
+        expected_b = 50000 + 10 * 70
+        
+        assert engine.compute_avg60_for_timestamp(settle_time, convention="A") == expected_a
+        assert engine.compute_avg60_for_timestamp(settle_time, convention="B") == expected_b
+        assert engine.compute_rolling_avg60(settle_time) == (expected_a, expected_b)
+    
+    def test_window_matches_feed_average(self):
+        """Test averages match the feed's closed-window average at the edges."""
+        feed = BRTIFeed(
+            use_cf_benchmarks=False,
+            fallback_exchanges=["coinbase"],
+            update_interval=1.0,
+            buffer_size=300
+        )
+        
+        # Ticks exactly on T-60, T-1 and T, plus a few outside the window
+        settle_time = 2000.0
+        offsets = [-61.0, -60.0, -30.5, -1.0, -0.5, 0.0, 0.5]
+        for j, offset in enumerate(offsets):
+            feed.price_buffer.append(PriceTick(
+                timestamp=settle_time + offset,
+                price=50000 + 100 * j,
+                source="test"
+            ))
+        
+        engine = SettlementEngine(brti_feed=feed, convention="B")
+        
+        def reference(start, end):
+            window = [t.price for t in feed.price_buffer if start <= t.timestamp <= end]
+            return sum(window) / len(window)
+        
+        expected_a = reference(settle_time - 60, settle_time - 1)
+        expected_b = reference(settle_time - 60, settle_time)
+        
+        assert engine.compute_avg60_for_timestamp(settle_time, convention="A") == pytest.approx(expected_a)
+        assert engine.compute_avg60_for_timestamp(settle_time, convention="B") == pytest.approx(expected_b)
+        avg60_a, avg60_b = engine.compute_rolling_avg60(settle_time)
+        assert avg60_a == pytest.approx(expected_a)
+        assert avg60_b == pytest.approx(expected_b)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,44 @@
+"""Tests for the virtual wallet simulation parameter sweep."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from test_simple_simulation import run_simulation, sweep_parameters
+
+
+class TestSweepParameters:
+    """Test the parallel sweep against the per-trade wallet."""
+
+    @pytest.fixture
+    def prices(self, tmp_path, monkeypatch):
+        """Write a random-walk price CSV where run_simulation expects it."""
+        rng = np.random.default_rng(0)
+        prices = 50000 * np.exp(np.cumsum(rng.normal(0, 0.001, 3000)))
+
+        (tmp_path / "data").mkdir()
+        (tmp_path / "logs").mkdir()
+        pd.DataFrame({
+            "timestamp": 1.7e9 + np.arange(len(prices)) * 60.0,
+            "price": prices
+        }).to_csv(tmp_path / "data" / "btc_1min.csv", index=False)
+        monkeypatch.chdir(tmp_path)
+
+        return prices
+
+    def test_sweep_point_matches_run_simulation(self, prices):
+        """Test a sweep row with run_simulation's parameters gives its results."""
+        stats = run_simulation(seed=0)
+
+        # run_simulation trades a $200 wallet with $15 max size and 1% min edge
+        result = sweep_parameters(prices, np.array([[200.0, 15.0, 0.01]]), seed=0).iloc[0]
+
+        assert stats["total_trades"] > 0
+        assert result["trades"] == stats["total_trades"]
+        assert result["wins"] == stats["wins"]
+        assert result["final_balance"] == stats["balance"]
+        assert result["peak_balance"] == stats["peak_balance"]
+        assert result["total_pnl"] == pytest.approx(stats["total_pnl"])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])